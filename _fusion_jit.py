@@ -0,0 +1,138 @@
+"""
+Polymarket Trading Bot - Signal Fusion Kernels
+===============================================
+Numeric core of SignalFusion, compiled with Numba when it is installed.
+
+Resolution order for the kernels:
+1. _fusion_aot - ahead-of-time build from build_aot.py (no JIT warm-up)
+2. Numba JIT   - compiled on first call, cached on disk
+3. Fallback    - scalar kernel as plain Python, batch kernel as NumPy ops
+
+Results are identical either way.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (bare or with options)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ACTION CODES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+ACTION_HOLD, ACTION_BUY_YES, ACTION_BUY_NO = 0, 1, 2
+ACTION_NAMES = ("HOLD", "BUY_YES", "BUY_NO")
+
+# Fused direction must clear this before an action is taken
+DIRECTION_DEADBAND = 0.1
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# KERNELS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@njit(cache=True)
+def _fuse_kernel_jit(m_dir, m_conf, w_dir, w_conf, yes_price, mw, ww, both, edge_threshold):
+    """
+    Fuse one market's momentum and whale signals.
+
+    Returns:
+        (direction, confidence, edge, action_code)
+    """
+    total_weight = mw + ww
+    if total_weight == 0.0:
+        return 0.0, 0.0, 0.0, ACTION_HOLD
+
+    direction = (m_dir * mw + w_dir * ww) / total_weight
+    confidence = (m_conf * mw + w_conf * ww) / total_weight
+
+    # Boost confidence if signals agree, reduce if they disagree
+    if both:
+        if (m_dir > 0) == (w_dir > 0):
+            confidence = min(1.0, confidence * 1.2)
+        else:
+            confidence *= 0.7
+
+    edge = abs(0.5 + direction * 0.5 - yes_price)
+
+    # Branchless: index ACTION_NAMES by direction, zeroed when the edge is too small
+    action = (
+        (direction > DIRECTION_DEADBAND) * ACTION_BUY_YES +
+        (direction < -DIRECTION_DEADBAND) * ACTION_BUY_NO
+    ) * (edge >= edge_threshold)
+
+    return direction, confidence, edge, action
+
+
+@njit(cache=True, parallel=True)
+def _fuse_kernel_vec(m_dir, m_conf, w_dir, w_conf, yes_price, mw, ww, both, edge_threshold):
+    """Run the scalar kernel over every market, split across cores."""
+    n = m_dir.shape[0]
+    direction = np.empty(n)
+    confidence = np.empty(n)
+    edge = np.empty(n)
+    action = np.empty(n, dtype=np.int8)
+    for i in prange(n):
+        d, c, e, a = _fuse_kernel_jit(
+            m_dir[i], m_conf[i], w_dir[i], w_conf[i], yes_price[i],
+            mw[i], ww[i], both[i], edge_threshold
+        )
+        direction[i] = d
+        confidence[i] = c
+        edge[i] = e
+        action[i] = a
+    return direction, confidence, edge, action
+
+
+def _fuse_arrays_numpy(m_dir, m_conf, w_dir, w_conf, yes_price, mw, ww, both, edge_threshold):
+    """NumPy equivalent of _fuse_kernel_vec for installs without Numba."""
+    total_weight = mw + ww
+    has_any = total_weight > 0
+    total_weight = np.where(has_any, total_weight, 1.0)
+
+    direction = np.where(has_any, (m_dir * mw + w_dir * ww) / total_weight, 0.0)
+    confidence = np.where(has_any, (m_conf * mw + w_conf * ww) / total_weight, 0.0)
+
+    agree = (m_dir > 0) == (w_dir > 0)
+    confidence = np.where(
+        both,
+        np.where(agree, np.minimum(1.0, confidence * 1.2), confidence * 0.7),
+        confidence
+    )
+
+    edge = np.where(has_any, np.abs(0.5 + direction * 0.5 - yes_price), 0.0)
+
+    action = (
+        (direction > DIRECTION_DEADBAND) * np.int8(ACTION_BUY_YES) +
+        (direction < -DIRECTION_DEADBAND) * np.int8(ACTION_BUY_NO)
+    ) * (edge >= edge_threshold)
+
+    return direction, confidence, edge, action
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENTRY POINTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+try:
+    import _fusion_aot
+    AOT_AVAILABLE = True
+except ImportError:
+    AOT_AVAILABLE = False
+
+if AOT_AVAILABLE:
+    fuse_kernel = _fusion_aot.fuse_kernel
+    fuse_arrays = _fusion_aot.fuse_arrays
+else:
+    fuse_kernel = _fuse_kernel_jit
+    # Batch entry point: (direction, confidence, edge, action_code) arrays
+    fuse_arrays = _fuse_kernel_vec if NUMBA_AVAILABLE else _fuse_arrays_numpy
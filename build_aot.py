@@ -0,0 +1,47 @@
+"""
+Polymarket Trading Bot - AOT Build for Signal Fusion
+=====================================================
+Compiles the fusion kernels from _fusion_jit.py ahead of time into the
+_fusion_aot extension module, so the first trading cycle after a fresh
+install doesn't stall on Numba JIT compilation.
+
+_fusion_jit picks up _fusion_aot automatically when it is importable.
+
+Usage:
+    python build_aot.py              # Writes _fusion_aot.*.so next to this file
+"""
+
+import os
+
+from numba.pycc import CC
+
+import _fusion_jit
+
+# Scalar: (m_dir, m_conf, w_dir, w_conf, yes_price, mw, ww, both, edge_threshold)
+SCALAR_SIGNATURE = "Tuple((f8, f8, f8, i8))(f8, f8, f8, f8, f8, f8, f8, b1, f8)"
+# Batch: same arguments as arrays, edge_threshold stays scalar
+BATCH_SIGNATURE = (
+    "Tuple((f8[:], f8[:], f8[:], i1[:]))"
+    "(f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], b1[:], f8)"
+)
+
+
+def build(output_dir: str = None) -> None:
+    """Compile the kernels into the _fusion_aot extension module."""
+    if _fusion_jit.AOT_AVAILABLE:
+        print("⚠ _fusion_aot is already importable; it will be rebuilt in place")
+    
+    cc = CC("_fusion_aot")
+    cc.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    cc.verbose = True
+    
+    # AOT builds are single-threaded, so prange in the batch kernel runs serially
+    cc.export("fuse_kernel", SCALAR_SIGNATURE)(_fusion_jit._fuse_kernel_jit.py_func)
+    cc.export("fuse_arrays", BATCH_SIGNATURE)(_fusion_jit._fuse_kernel_vec.py_func)
+    
+    cc.compile()
+    print(f"✓ Built _fusion_aot in {cc.output_dir}")
+
+
+if __name__ == "__main__":
+    build()
@@ -89,6 +89,9 @@ class WhaleConfig:
     min_pnl_to_track: float = 10000
     alert_on_position_usd: float = 5000
     position_refresh_seconds: int = 60
+    cache_ttl_seconds: int = 60  # Reuse a whale trade collection for this long
+    subgraph_rps: float = 5.0   # Sustained subgraph request rate (token bucket)
+    subgraph_burst: int = 10    # Requests allowed back-to-back before throttling
     
     # Known whale wallets
     known_whales: List[str] = field(default_factory=lambda: [
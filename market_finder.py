@@ -11,7 +11,7 @@ import re
 import time
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
 from config import GAMMA_API_BASE, Config, REQUEST_TIMEOUT, MAX_RETRIES, RETRY_DELAY
@@ -20,6 +20,10 @@ logger = logging.getLogger(__name__)
 
 DATA_API_BASE = "https://data-api.polymarket.com"
 
+# Trade outcome labels counted toward each side's price estimate
+_UP_OUTCOMES = frozenset({"up", "yes"})
+_DOWN_OUTCOMES = frozenset({"down", "no"})
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # DATA CLASSES
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -39,6 +43,10 @@ class CryptoMarket:
     liquidity: float
     end_time: Optional[datetime]
     url: str
+    direction_sign: int = field(init=False, repr=False)  # +1 for UP, -1 for DOWN
+    
+    def __post_init__(self):
+        self.direction_sign = 1 if self.direction == "UP" else -1
     
     @property
     def minutes_remaining(self) -> float:
@@ -449,9 +457,9 @@ class MarketFinder:
             
             # Estimate prices from recent trades
             up_prices = [float(t.get("price", 0)) for t in trades_list 
-                         if t.get("outcome", "").lower() in ["up", "yes"]]
+                         if t.get("outcome", "").lower() in _UP_OUTCOMES]
             down_prices = [float(t.get("price", 0)) for t in trades_list 
-                           if t.get("outcome", "").lower() in ["down", "no"]]
+                           if t.get("outcome", "").lower() in _DOWN_OUTCOMES]
             
             yes_price = sum(up_prices) / len(up_prices) if up_prices else 0.5
             no_price = sum(down_prices) / len(down_prices) if down_prices else 0.5
@@ -144,6 +144,10 @@ class PositionManager:
         """Check if we already have a position in this market."""
         return market_id in self.open_positions
     
+    def get_open_market_ids(self) -> frozenset:
+        """Snapshot of market IDs we currently hold positions in."""
+        return frozenset(self.open_positions)
+    
     # ─────────────────────────────────────────────────────────────────────────
     # TRADE RECORDING
     # ─────────────────────────────────────────────────────────────────────────
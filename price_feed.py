@@ -8,7 +8,7 @@ import requests
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from collections import deque
 import logging
 
@@ -43,6 +43,10 @@ class MomentumSignal:
     direction: str  # "UP" or "DOWN"
     confidence: float  # 0.0 to 1.0
     timestamp: datetime
+    direction_sign: int = field(init=False, repr=False)  # +1 for UP, -1 for DOWN
+    
+    def __post_init__(self):
+        self.direction_sign = 1 if self.direction == "UP" else -1
     
     @property
     def predicted_probability(self) -> float:
@@ -79,6 +83,9 @@ class PriceFeed:
             coin: deque(maxlen=history_seconds) for coin in self.coins
         }
         
+        # Latest momentum signal per coin, refreshed in place by fetch_prices
+        self._signals_by_coin: Dict[str, MomentumSignal] = {}
+        
         self.last_fetch: Optional[datetime] = None
         self.fetch_count = 0
         self.error_count = 0
@@ -90,10 +97,18 @@ class PriceFeed:
         Returns:
             Dict mapping coin_id to current USD price
         """
-        coin_ids = ",".join(self.coins)
+        return self.fetch_prices_batch(self.coins)
+    
+    def fetch_prices_batch(self, coin_ids: List[str]) -> Dict[str, float]:
+        """
+        Fetch prices for many coins with a single /simple/price request.
+        
+        Returns:
+            Dict mapping coin_id to current USD price
+        """
         url = f"{COINGECKO_API}/simple/price"
         params = {
-            "ids": coin_ids,
+            "ids": ",".join(coin_ids),
             "vs_currencies": "usd",
             "include_24hr_change": "true"
         }
@@ -106,15 +121,23 @@ class PriceFeed:
             prices = {}
             now = datetime.utcnow()
             
-            for coin_id in self.coins:
+            for coin_id in coin_ids:
                 if coin_id in data:
                     price = data[coin_id].get("usd", 0)
                     prices[coin_id] = price
                     
                     # Add to history
+                    if coin_id not in self.price_history:
+                        self.price_history[coin_id] = deque(maxlen=self.history_seconds)
                     self.price_history[coin_id].append(
                         PricePoint(coin_id=coin_id, price=price, timestamp=now)
                     )
+                    
+                    signal = self.calculate_momentum(coin_id)
+                    if signal:
+                        self._signals_by_coin[coin_id] = signal
+                    else:
+                        self._signals_by_coin.pop(coin_id, None)
             
             self.last_fetch = now
             self.fetch_count += 1
@@ -201,6 +224,11 @@ class PriceFeed:
             timestamp=current.timestamp
         )
     
+    @property
+    def signals_by_coin(self) -> Dict[str, MomentumSignal]:
+        """Momentum signals as of the last successful fetch, keyed by coin_id."""
+        return self._signals_by_coin
+    
     def get_all_signals(self) -> List[MomentumSignal]:
         """Calculate momentum signals for all tracked coins."""
         signals = []
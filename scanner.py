@@ -72,6 +72,18 @@ class MultiOutcomeArb:
 # API FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Shared session so pages reuse one keep-alive connection with compressed bodies
+_SESSION = requests.Session()
+_SESSION.headers.update(Config.headers)
+_SESSION.headers.update({"Accept-Encoding": "gzip, deflate"})
+
+# Conditional-fetch state per page offset: validators from the last 200 response
+# and the decoded body to reuse when Gamma answers 304 Not Modified
+_etag_by_offset: Dict[int, str] = {}
+_last_modified_by_offset: Dict[int, str] = {}
+_body_by_offset: Dict[int, List[Dict]] = {}
+
+
 def fetch_active_markets(limit: int = 100, offset: int = 0) -> List[Dict]:
     """
     Fetch active markets from Gamma API with pagination.
@@ -93,16 +105,38 @@ def fetch_active_markets(limit: int = 100, offset: int = 0) -> List[Dict]:
         "ascending": "false"
     }
     
+    headers = {}
+    if offset in _body_by_offset:
+        if offset in _etag_by_offset:
+            headers["If-None-Match"] = _etag_by_offset[offset]
+        if offset in _last_modified_by_offset:
+            headers["If-Modified-Since"] = _last_modified_by_offset[offset]
+    
     for attempt in range(MAX_RETRIES):
         try:
-            response = requests.get(
+            response = _SESSION.get(
                 url, 
-                headers=Config.headers, 
+                headers=headers, 
                 params=params, 
                 timeout=REQUEST_TIMEOUT
             )
+            
+            # Page unchanged since last scan - skip the download and JSON decode
+            if response.status_code == 304 and offset in _body_by_offset:
+                return _body_by_offset[offset]
+            
             response.raise_for_status()
-            return response.json()
+            markets = response.json()
+            
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                _body_by_offset[offset] = markets
+                if etag:
+                    _etag_by_offset[offset] = etag
+                if last_modified:
+                    _last_modified_by_offset[offset] = last_modified
+            return markets
         except requests.exceptions.RequestException as e:
             if attempt < MAX_RETRIES - 1:
                 print(f"  ⚠ API error (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
@@ -118,7 +152,7 @@ def fetch_market_details(market_id: str) -> Optional[Dict]:
     url = f"{GAMMA_API_BASE}/markets/{market_id}"
     
     try:
-        response = requests.get(url, headers=Config.headers, timeout=REQUEST_TIMEOUT)
+        response = _SESSION.get(url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -24,11 +24,83 @@ except ImportError:
     SCIPY_AVAILABLE = False
     print("⚠ scipy/sklearn not installed. Run: pip install scipy scikit-learn")
 
-from whale_collector import WhaleDataCollector, WhaleTrade, MarketSignal
+from whale_collector import WhaleDataCollector, WhaleTrade, MarketSignal, TradeColumns
 from config import Config
+from _fusion_jit import NUMBA_AVAILABLE, njit, prange
 
 logger = logging.getLogger(__name__)
 
+# Ensemble weight for wallets without a PnL entry
+DEFAULT_WALLET_WEIGHT = 0.1
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENSEMBLE KERNELS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@njit(cache=True, parallel=True, fastmath=True)
+def _wallet_ensemble_jit(pair_starts, wallet_signal, wallet_weight):
+    """
+    Per-market weighted ensemble over per-wallet signals (aggregate_market_signals, batched).
+    
+    Market g owns wallets pair_starts[g]:pair_starts[g + 1].
+    
+    Returns:
+        (mean, std, direction, confidence) arrays indexed by market code
+    """
+    k = pair_starts.shape[0]
+    n = wallet_signal.shape[0]
+    mean = np.zeros(k)
+    std = np.zeros(k)
+    direction = np.zeros(k)
+    confidence = np.zeros(k)
+    for g in prange(k):
+        start = pair_starts[g]
+        end = pair_starts[g + 1] if g + 1 < k else n
+        count = end - start
+        weighted_sum = 0.0
+        weight_total = 0.0
+        signal_sum = 0.0
+        max_signal = 1.0
+        for i in range(start, end):
+            weighted_sum += wallet_signal[i] * wallet_weight[i]
+            weight_total += wallet_weight[i]
+            signal_sum += wallet_signal[i]
+            max_signal = max(max_signal, abs(wallet_signal[i]))
+        m = weighted_sum / weight_total
+        sd = 0.0
+        if count > 1:
+            avg = signal_sum / count
+            sq_sum = 0.0
+            for i in range(start, end):
+                d = wallet_signal[i] - avg
+                sq_sum += d * d
+            sd = np.sqrt(sq_sum / count)
+        d = min(max(m / max_signal, -1.0), 1.0)
+        agreement = 1.0 - sd / (max_signal + 1e-6)
+        mean[g] = m
+        std[g] = sd
+        direction[g] = d
+        confidence[g] = min(max(agreement * abs(d), 0.0), 1.0)
+    return mean, std, direction, confidence
+
+
+def _wallet_ensemble_numpy(pair_starts, wallet_signal, wallet_weight):
+    """NumPy equivalent of _wallet_ensemble_jit for installs without Numba."""
+    if len(wallet_signal) == 0:
+        empty = np.zeros(0)
+        return empty, empty, empty, empty
+    counts = np.diff(np.append(pair_starts, len(wallet_signal)))
+    mean = np.add.reduceat(wallet_signal * wallet_weight, pair_starts) / np.add.reduceat(wallet_weight, pair_starts)
+    avg = np.add.reduceat(wallet_signal, pair_starts) / counts
+    std = np.sqrt(np.add.reduceat((wallet_signal - np.repeat(avg, counts)) ** 2, pair_starts) / counts)
+    max_signal = np.maximum(np.maximum.reduceat(np.abs(wallet_signal), pair_starts), 1.0)
+    direction = np.clip(mean / max_signal, -1, 1)
+    confidence = np.clip((1.0 - std / (max_signal + 1e-6)) * np.abs(direction), 0, 1)
+    return mean, std, direction, confidence
+
+
+wallet_ensemble_kernel = _wallet_ensemble_jit if NUMBA_AVAILABLE else _wallet_ensemble_numpy
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SIGNAL AGGREGATOR
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -151,7 +223,7 @@ class SignalAggregator:
         signals = []
         
         for wallet, signal in wallet_signals.items():
-            w = weights.get(wallet.lower(), 0.1)
+            w = weights.get(wallet.lower(), DEFAULT_WALLET_WEIGHT)
             weighted_sum += signal * w
             weight_total += w
             signals.append(signal)
@@ -196,6 +268,50 @@ class SignalAggregator:
             timestamp=datetime.utcnow()
         )
     
+    def aggregate_columns(
+        self,
+        columns: TradeColumns,
+        questions: Dict[str, str]
+    ) -> List[AggregatedSignal]:
+        """
+        aggregate_market_signals for every market at once, from the collector's columns.
+        
+        One kernel pass over per-(market, wallet) totals replaces the per-trade
+        dict loop; signals come out in market id order.
+        """
+        pair_starts, pair_wallet, pair_signal, pair_volume = columns.market_wallet_totals()
+        if len(pair_signal) == 0:
+            return []
+        
+        weights = self._compute_softmax_weights()
+        wallet_weight = np.array(
+            [weights.get(w, DEFAULT_WALLET_WEIGHT) for w in columns.wallet_ids.tolist()],
+            dtype=np.float64
+        )[pair_wallet]
+        mean, std, direction, confidence = wallet_ensemble_kernel(pair_starts, pair_signal, wallet_weight)
+        
+        whale_counts = np.diff(np.append(pair_starts, len(pair_signal)))
+        ci_margin = np.where(whale_counts > 1, 1.96 * std / np.sqrt(whale_counts), 0.0)
+        volumes = np.add.reduceat(pair_volume, pair_starts)
+        
+        now = datetime.utcnow()
+        return [
+            AggregatedSignal(
+                market_id=market_id,
+                market_question=questions[market_id],
+                direction=float(direction[code]),
+                confidence=float(confidence[code]),
+                mean=float(mean[code]),
+                std=float(std[code]),
+                lower_ci=float(mean[code] - ci_margin[code]),
+                upper_ci=float(mean[code] + ci_margin[code]),
+                whale_count=int(whale_counts[code]),
+                total_volume=float(volumes[code]),
+                timestamp=now
+            )
+            for code, market_id in enumerate(columns.market_ids.tolist())
+        ]
+    
     def detect_whale_consensus(self, trades: List[WhaleTrade]) -> Tuple[float, float]:
         """
         Detect if whales are in consensus (all betting same direction).
@@ -276,15 +392,14 @@ class SignalAggregator:
         # Collect fresh data
         self.collector.collect_all_whale_data(lookback_hours=lookback_hours)
         
-        # Get trades grouped by market
-        markets = self.collector.get_active_markets()
-        
-        signals = []
-        for market_id, trades in markets.items():
-            signal = self.aggregate_market_signals(trades)
-            if signal:
-                signals.append(signal)
-                self.signals_cache[market_id] = signal
+        # Aggregate every market in one pass over the columnar trades
+        questions = {
+            market_id: trades[0].market_question
+            for market_id, trades in self.collector.get_active_markets().items()
+        }
+        signals = self.aggregate_columns(self.collector.trade_columns, questions)
+        for signal in signals:
+            self.signals_cache[signal.market_id] = signal
         
         # Sort by confidence
         signals.sort(key=lambda s: s.confidence, reverse=True)
@@ -0,0 +1,79 @@
+"""
+Parity tests for SignalAggregator's columnar path.
+
+get_all_market_signals runs the ensemble kernel over the collector's
+TradeColumns; every market must match aggregate_market_signals on the
+same trades.
+"""
+
+import numpy as np
+import pytest
+
+import signal_aggregator
+from signal_aggregator import SignalAggregator
+from whale_collector import WhaleDataCollector, WhaleTrade
+
+
+def _random_trades(seed: int, n: int = 600):
+    rng = np.random.default_rng(seed)
+    wallets = [f"0x{i:040x}" for i in range(0xa0, 0xac)] + ["0x9d84ce0306f8551e02efef1680475fc0f1dc1344"]
+    wallets.append(wallets[10].upper().replace("0X", "0x"))  # Same wallet, checksum-style case
+    trades = []
+    for _ in range(n):
+        market = int(rng.integers(0, 40))
+        sign = 1 if rng.random() < 0.6 else -1
+        # Mix sub-contract and large sizes so both max_signal branches are hit
+        size = float(rng.choice([rng.uniform(0.05, 0.9), rng.uniform(50, 5000)]))
+        price = float(rng.uniform(0.05, 0.95))
+        trades.append(WhaleTrade(
+            wallet=str(rng.choice(wallets)),
+            market_id=f"m{market:02d}",
+            market_question=f"Will BTC close above {market}k?",
+            outcome="YES" if sign > 0 else "NO",
+            side="BUY",
+            size=size,
+            price=price,
+            usd_value=size * price,
+            timestamp_ts=1.7e9 + float(rng.uniform(0, 86400)),
+            sign=sign
+        ))
+    return trades
+
+
+@pytest.fixture
+def aggregator():
+    collector = WhaleDataCollector(warm_connection=False)
+    yield SignalAggregator(collector)
+    collector.close()
+
+
+@pytest.mark.parametrize("kernel", ["jit", "numpy"])
+@pytest.mark.parametrize("weighted", [False, True], ids=["default-weights", "skewed-weights"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_columnar_signals_match_per_market_loop(aggregator, monkeypatch, seed, weighted, kernel):
+    trades = _random_trades(seed)
+    monkeypatch.setattr(aggregator.collector, "fetch_trade_pages", lambda pages, crypto_only=True: trades)
+    if kernel == "numpy":
+        monkeypatch.setattr(signal_aggregator, "wallet_ensemble_kernel", signal_aggregator._wallet_ensemble_numpy)
+    if weighted:
+        skewed = {f"0x{i:040x}": 0.02 + 0.3 * (i % 4) for i in range(0xa0, 0xac, 2)}
+        monkeypatch.setattr(aggregator, "_compute_softmax_weights", lambda: skewed)
+
+    signals = {s.market_id: s for s in aggregator.get_all_market_signals()}
+
+    expected = {
+        market_id: aggregator.aggregate_market_signals(market_trades)
+        for market_id, market_trades in aggregator.collector.get_active_markets().items()
+    }
+    assert signals.keys() == expected.keys()
+    for market_id, want in expected.items():
+        got = signals[market_id]
+        assert got.market_question == want.market_question
+        assert got.whale_count == want.whale_count
+        for name in ("direction", "confidence", "mean", "std", "lower_ci", "upper_ci", "total_volume"):
+            assert getattr(got, name) == pytest.approx(float(getattr(want, name)), rel=1e-9, abs=1e-9), name
+
+
+def test_no_trades_gives_no_signals(aggregator, monkeypatch):
+    monkeypatch.setattr(aggregator.collector, "fetch_trade_pages", lambda pages, crypto_only=True: [])
+    assert aggregator.get_all_market_signals() == []
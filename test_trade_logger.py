@@ -0,0 +1,91 @@
+"""
+Journal recovery tests for trade_logger.
+
+A crash mid-append leaves a torn record at the end of the journal; loading
+must keep every record before it and leave the file safe to append to.
+"""
+
+import pytest
+
+from trade_logger import TradeLogger, LOG_FORMAT_JSONL, LOG_FORMAT_MSGPACK
+
+
+def _write_history(log_file, bankroll_file, log_format):
+    """Seven trades, two of them resolved (+5, -2). Returns the trade ids."""
+    trade_logger = TradeLogger(log_file, bankroll_file, log_format=log_format)
+    ids = [
+        trade_logger.log_trade(f"m{i}", f"Will BTC close above {i}?", "YES", 10.0, 0.5, 0.04, 0.6)
+        for i in range(7)
+    ]
+    trade_logger.log_outcome(ids[0], True, 5.0)
+    trade_logger.log_outcome(ids[1], False, -2.0)
+    trade_logger.close()
+    return ids
+
+
+def _assert_history_survived(trade_logger, ids):
+    stats = trade_logger.get_stats()
+    assert stats['total_trades'] == 7
+    assert stats['total_pnl'] == 3.0
+    assert stats['open_positions'] == 5
+    assert stats['wins'] == 1 and stats['losses'] == 1
+    assert set(trade_logger._open_by_id) == set(ids[2:])
+    assert [t['trade_id'] for t in trade_logger.get_recent_trades(7)] == ids
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / "bot_trades.log"), str(tmp_path / "bankroll.json")
+
+
+def test_jsonl_truncated_last_line_keeps_earlier_trades(paths):
+    log_file, bankroll_file = paths
+    ids = _write_history(log_file, bankroll_file, LOG_FORMAT_JSONL)
+    with open(log_file, 'ab') as f:
+        f.write(b'{"trade_id": "T1", "timest')
+
+    trade_logger = TradeLogger(log_file, bankroll_file)
+    _assert_history_survived(trade_logger, ids)
+
+    # The torn tail is gone, so the next append is readable after a restart
+    new_id = trade_logger.log_trade("m7", "Will ETH close above 7?", "NO", 5.0, 0.4, 0.03, 0.55)
+    trade_logger.close()
+    reloaded = TradeLogger(log_file, bankroll_file)
+    assert reloaded.get_stats()['total_trades'] == 8
+    assert new_id in reloaded._open_by_id
+
+
+def test_jsonl_corrupt_middle_line_is_skipped(paths):
+    log_file, bankroll_file = paths
+    ids = _write_history(log_file, bankroll_file, LOG_FORMAT_JSONL)
+    with open(log_file, 'rb') as f:
+        lines = f.read().splitlines(keepends=True)
+    lines.insert(3, b'\x00garbage\n')
+    with open(log_file, 'wb') as f:
+        f.write(b''.join(lines))
+
+    _assert_history_survived(TradeLogger(log_file, bankroll_file), ids)
+
+
+@pytest.mark.parametrize("cut", [2, 10], ids=["partial-header", "partial-payload"])
+def test_msgpack_truncated_last_frame_keeps_earlier_trades(paths, cut):
+    pytest.importorskip("msgpack")
+    log_file, bankroll_file = paths
+    ids = _write_history(log_file, bankroll_file, LOG_FORMAT_MSGPACK)
+    # Start another trade frame, then cut it short
+    tail = TradeLogger(log_file + ".tail", bankroll_file, log_format=LOG_FORMAT_MSGPACK)
+    tail.log_trade("m7", "Will ETH close above 7?", "NO", 5.0, 0.4, 0.03, 0.55)
+    tail.close()
+    with open(log_file + ".tail", 'rb') as f:
+        frame = f.read()
+    with open(log_file, 'ab') as f:
+        f.write(frame[:cut])
+
+    trade_logger = TradeLogger(log_file, bankroll_file, log_format=LOG_FORMAT_MSGPACK)
+    _assert_history_survived(trade_logger, ids)
+
+    new_id = trade_logger.log_trade("m8", "Will SOL close above 8?", "YES", 5.0, 0.4, 0.03, 0.55)
+    trade_logger.close()
+    reloaded = TradeLogger(log_file, bankroll_file, log_format=LOG_FORMAT_MSGPACK)
+    assert reloaded.get_stats()['total_trades'] == 8
+    assert new_id in reloaded._open_by_id
@@ -12,15 +12,38 @@ Features:
 Created: Jan 2026
 """
 
+import atexit
+import functools
 import logging
+import os
+import time
 from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass, field
 from typing import Dict, Optional, Tuple, List
 import json
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between routine state writes (trades and kill switch save immediately)
+SAVE_INTERVAL_SECONDS = 30
+
+
+@functools.lru_cache(maxsize=1)
+def _is_night_minute(minute_bucket: int) -> bool:
+    """Nighttime check for a UTC epoch minute (cached: repeat calls within a minute are free)."""
+    hour = (minute_bucket // 60) % 24
+    return hour >= 23 or hour < 7
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # DATA CLASSES
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -107,14 +130,35 @@ class ThresholdController:
         self.kill_switch_active = False
         self.kill_switch_reason: Optional[str] = None
         
+        # Cached reciprocals for drawdown / daily PnL (and the values they invert)
+        self._inv_peak = 0.0
+        self._inv_peak_of = 0.0
+        self._inv_starting = 0.0
+        self._inv_starting_of = 0.0
+        
+        # Inputs of the last threshold computation
+        self._last_threshold_key: Optional[Tuple] = None
+        
+        # Write coalescing
+        self._dirty = False
+        self._last_save_ts = float('-inf')
+        
         # Load persisted state
         self._load_state()
+        atexit.register(self.flush)
+    
+    def _now(self) -> datetime:
+        return datetime.now(timezone.utc)
+    
+    @staticmethod
+    def _date_str(now: datetime) -> str:
+        return f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
     
     def _today(self) -> str:
-        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        return self._date_str(self._now())
     
     def _current_hour(self) -> int:
-        return datetime.now(timezone.utc).hour
+        return self._now().hour
     
     def _load_state(self):
         """Load state from disk."""
@@ -135,6 +179,17 @@ class ThresholdController:
             except Exception as e:
                 logger.warning(f"Failed to load threshold state: {e}")
     
+    def _mark_dirty(self):
+        """Note unsaved changes; write only if the last save is old enough."""
+        self._dirty = True
+        if time.monotonic() - self._last_save_ts >= SAVE_INTERVAL_SECONDS:
+            self._save_state()
+    
+    def flush(self):
+        """Write pending state to disk (also runs at interpreter exit)."""
+        if self._dirty:
+            self._save_state()
+    
     def _save_state(self):
         """Persist state to disk."""
         data = {
@@ -151,12 +206,21 @@ class ThresholdController:
             "kill_switch_active": self.kill_switch_active,
             "kill_switch_reason": self.kill_switch_reason
         }
-        with open(self.data_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Write to a temp file and rename so a crash never leaves a truncated file
+        tmp_file = self.data_file.with_suffix('.tmp')
+        if ORJSON_AVAILABLE:
+            tmp_file.write_bytes(orjson.dumps(data))
+        else:
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+        os.replace(tmp_file, self.data_file)
+        self._dirty = False
+        self._last_save_ts = time.monotonic()
     
-    def is_nighttime(self) -> bool:
+    def is_nighttime(self, hour: Optional[int] = None) -> bool:
         """Check if we're in nighttime mode (11PM - 7AM UTC)."""
-        hour = self._current_hour()
+        if hour is None:
+            return _is_night_minute(int(time.time()) // 60)
         return hour >= 23 or hour < 7
     
     def can_trade(self) -> Tuple[bool, str]:
@@ -171,8 +235,9 @@ class ThresholdController:
             return False, f"Kill switch active: {self.kill_switch_reason}"
         
         # Reset session if new day
-        if self.session.date != self._today():
-            self.session = TradingSession(date=self._today())
+        today = self._today()
+        if self.session.date != today:
+            self.session = TradingSession(date=today)
             self.kill_switch_active = False
             self.kill_switch_reason = None
             logger.info("Reset trading session for new day")
@@ -189,18 +254,30 @@ class ThresholdController:
         
         Call this at the start of each trading cycle.
         """
+        hour_of_day = self._now().hour
+        
         # Update session bankroll tracking
         self.session.current_bankroll = current_bankroll
         if current_bankroll > self.session.peak_bankroll:
             self.session.peak_bankroll = current_bankroll
         
-        # Calculate drawdown
-        if self.session.peak_bankroll > 0:
-            drawdown = (self.session.peak_bankroll - current_bankroll) / self.session.peak_bankroll
-            self.session.max_drawdown_pct = max(self.session.max_drawdown_pct, drawdown)
+        # Calculate drawdown (reciprocal only recomputed when the peak moves)
+        peak = self.session.peak_bankroll
+        if peak > 0:
+            if peak != self._inv_peak_of:
+                self._inv_peak_of = peak
+                self._inv_peak = 1.0 / peak
+            drawdown = (peak - current_bankroll) * self._inv_peak
+            if drawdown > self.session.max_drawdown_pct:
+                self.session.max_drawdown_pct = drawdown
         
         # Check for daily loss limit (kill switch)
-        daily_pnl_pct = (current_bankroll - starting_bankroll) / starting_bankroll if starting_bankroll > 0 else 0
+        daily_pnl_pct = 0
+        if starting_bankroll > 0:
+            if starting_bankroll != self._inv_starting_of:
+                self._inv_starting_of = starting_bankroll
+                self._inv_starting = 1.0 / starting_bankroll
+            daily_pnl_pct = (current_bankroll - starting_bankroll) * self._inv_starting
         if daily_pnl_pct < -self.max_daily_loss_pct:
             self.kill_switch_active = True
             self.kill_switch_reason = f"Daily loss limit exceeded ({daily_pnl_pct:.1%})"
@@ -209,7 +286,6 @@ class ThresholdController:
             return
         
         # Calculate trade rate adjustment
-        hour_of_day = self._current_hour()
         hours_elapsed = max(1, hour_of_day if hour_of_day > 0 else 1)
         expected_trades = (hours_elapsed / 24) * self.target_trades
         
@@ -231,7 +307,21 @@ class ThresholdController:
             self.state.adjustment_factor = 0.9 * self.state.adjustment_factor + 0.1 * 1.0
         
         # Apply nighttime multiplier
-        self.state.is_nighttime = self.is_nighttime()
+        self.state.is_nighttime = self.is_nighttime(hour_of_day)
+        
+        # Skip the threshold math when none of its inputs moved since last cycle
+        threshold_key = (
+            self.state.adjustment_factor,
+            self.state.is_nighttime,
+            self.session.max_drawdown_pct,
+            self.state.base_min_ev_frac,
+            self.state.base_min_confidence
+        )
+        if threshold_key == self._last_threshold_key:
+            self._mark_dirty()
+            return
+        self._last_threshold_key = threshold_key
+        
         night_multiplier = 2.0 if self.state.is_nighttime else 1.0
         
         # Apply drawdown multiplier (tighten if in drawdown)
@@ -250,7 +340,33 @@ class ThresholdController:
             f"min_ev={self.state.min_ev_frac:.4f}, min_conf={self.state.min_confidence:.2f}"
         )
         
-        self._save_state()
+        self._mark_dirty()
+    
+    def batch_update(self, bankrolls: np.ndarray) -> float:
+        """
+        Replay a series of bankroll observations in one vectorized pass.
+        
+        Updates peak, current bankroll and max drawdown exactly as repeated
+        update_thresholds() calls would, without recomputing thresholds.
+        
+        Returns:
+            Max drawdown within the batch
+        """
+        bankrolls = np.asarray(bankrolls, dtype=np.float64)
+        if bankrolls.size == 0:
+            return 0.0
+        
+        peaks = np.maximum(np.maximum.accumulate(bankrolls), self.session.peak_bankroll)
+        drawdowns = np.divide(
+            peaks - bankrolls, peaks, out=np.zeros_like(bankrolls), where=peaks > 0
+        )
+        max_dd = float(drawdowns.max())
+        
+        self.session.peak_bankroll = float(peaks[-1])
+        self.session.current_bankroll = float(bankrolls[-1])
+        self.session.max_drawdown_pct = max(self.session.max_drawdown_pct, max_dd)
+        self._mark_dirty()
+        return max_dd
     
     def record_trade(self, pnl: float):
         """Record a completed trade."""
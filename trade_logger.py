@@ -6,16 +6,121 @@ Persistent trade logging with file storage and dashboard integration.
 Features:
 - Log executed trades with full details
 - Track open positions and outcomes
-- Calculate live PnL
-- Persist to JSON lines file
+- Calculate live PnL (NumPy columns over the full trade history)
+- Persist to append-only journal (outcomes recorded as UPDATE deltas),
+  either JSON lines or length-prefixed MessagePack frames
+- Journal writes batched by a background writer thread
+
+Usage:
+    python trade_logger.py bot_trades.bin --format msgpack --export-json
 """
 
+import atexit
+import functools
+import itertools
 import json
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 from collections import deque
-from typing import Optional, List, Dict, Any
-# Note: Threading removed for simplicity in single-process Flask app
+from dataclasses import dataclass, asdict, fields, is_dataclass
+from typing import Optional, List, Dict, Any, Union
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Journal encodings: JSON lines, or <4-byte LE length><msgpack bytes> frames
+LOG_FORMAT_JSONL = "jsonl"
+LOG_FORMAT_MSGPACK = "msgpack"
+
+# Journals larger than this are streamed line by line instead of read whole
+STREAM_THRESHOLD_BYTES = 100 * 1024 * 1024
+
+# Seconds the writer thread waits to collect a batch of journal appends
+WRITE_BATCH_SECONDS = 0.1
+
+# Fold UPDATE records back into their trades once this many have accumulated
+COMPACT_EVERY = 1000
+
+# Status codes for the columnar trade history
+STATUS_OPEN, STATUS_WON, STATUS_LOST, STATUS_OTHER = 0, 1, 2, 3
+STATUS_CODES = {'OPEN': STATUS_OPEN, 'WON': STATUS_WON, 'LOST': STATUS_LOST}
+
+# Records kept as objects for the recent-activity views; stats use the columns
+RECENT_WINDOW = 100
+
+# Questions longer than this are shortened in the journal
+QUESTION_MAX_CHARS = 60
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DATA CLASSES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass(slots=True)
+class TradeRecord:
+    """An executed trade as stored in the journal."""
+    trade_id: str
+    timestamp: str
+    market_id: str
+    market_question: str
+    direction: str
+    size: float
+    price: float
+    edge: float                      # Percentage
+    confidence: float                # Percentage
+    whale_signal: float = 0.0
+    momentum_signal: float = 0.0
+    status: str = 'OPEN'             # OPEN, WON, LOST, CANCELLED
+    outcome: Optional[str] = None
+    pnl: Optional[float] = None
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class SkipRecord:
+    """A skipped trade opportunity with its reason."""
+    timestamp: str
+    market_question: str
+    reason: str
+    type: str = 'SKIP'
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+_TRADE_FIELDS = frozenset(f.name for f in fields(TradeRecord))
+_SKIP_FIELDS = frozenset(f.name for f in fields(SkipRecord))
+
+
+def _record_from_dict(data: Dict) -> Union[TradeRecord, SkipRecord]:
+    """Build a record from a journal line, ignoring unknown keys."""
+    if 'trade_id' in data:
+        return TradeRecord(**{k: v for k, v in data.items() if k in _TRADE_FIELDS})
+    return SkipRecord(**{k: v for k, v in data.items() if k in _SKIP_FIELDS})
+
+
+@functools.lru_cache(maxsize=1024)
+def _truncate(question: str) -> str:
+    """Shorten a market question for logging (cached; questions repeat per market)."""
+    if len(question) > QUESTION_MAX_CHARS:
+        return question[:QUESTION_MAX_CHARS] + '...'
+    return question
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TRADE LOGGER CLASS
@@ -24,16 +129,50 @@ from typing import Optional, List, Dict, Any
 class TradeLogger:
     """Manages trade logging, persistence, and PnL tracking."""
     
-    def __init__(self, log_file: str = "bot_trades.log", bankroll_file: str = "bankroll.json"):
+    def __init__(
+        self,
+        log_file: str = "bot_trades.log",
+        bankroll_file: str = "bankroll.json",
+        log_format: str = LOG_FORMAT_JSONL
+    ):
+        if log_format not in (LOG_FORMAT_JSONL, LOG_FORMAT_MSGPACK):
+            raise ValueError(f"Unknown log format: {log_format}")
+        if log_format == LOG_FORMAT_MSGPACK and not MSGPACK_AVAILABLE:
+            raise ImportError("msgpack log format requires: pip install msgpack")
+        
         self.log_file = log_file
         self.bankroll_file = bankroll_file
-        self.trades: deque = deque(maxlen=100)  # Keep last 100 trades in memory
+        self.log_format = log_format
+        self.trades: deque = deque(maxlen=RECENT_WINDOW)  # Ring buffer of recent records
+        self._pending_updates = 0
+        self._journal_damaged = False  # Last replay skipped unreadable bytes
+        self.version = 0  # Bumped on every new record or outcome; cheap change detection
+        self._trade_counter = itertools.count()
+        
+        # Index over the in-memory window, plus every still-open trade
+        self._by_id: Dict[str, TradeRecord] = {}
+        self._open_by_id: Dict[str, TradeRecord] = {}
+        
+        # Columnar history of every trade (skips excluded) for stats
+        self._n = 0
+        self._row_by_id: Dict[str, int] = {}
+        self._pnl_arr = np.zeros(256, dtype=np.float64)
+        self._size_arr = np.zeros(256, dtype=np.float64)
+        self._status_arr = np.zeros(256, dtype=np.int8)
         
         # Load initial bankroll
         self.initial_bankroll = 1000.0
         self.current_bankroll = self._load_bankroll()
         
-        # Load existing trades on startup
+        # Journal appends are encoded by the caller and written in batches
+        self._write_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._write_lock = threading.Lock()
+        self._write_wake = threading.Event()
+        self._log_fd: Optional[int] = None  # O_APPEND descriptor, opened on first write
+        threading.Thread(target=self._writer_loop, name="trade-log-writer", daemon=True).start()
+        atexit.register(self.close)
+        
+        # Load existing trades on startup (may compact, so after the writer is set up)
         self._load_trades()
     
     def _load_bankroll(self) -> float:
@@ -49,28 +188,182 @@ class TradeLogger:
     
     def _save_bankroll(self):
         """Save current bankroll to file."""
+        data = {
+            'initial': self.initial_bankroll,
+            'current': self.current_bankroll,
+            'last_updated': datetime.now().isoformat()
+        }
+        # Write to a temp file and rename so a crash never leaves a truncated file
+        tmp_file = self.bankroll_file + '.tmp'
         try:
-            with open(self.bankroll_file, 'w') as f:
-                json.dump({
-                    'initial': self.initial_bankroll,
-                    'current': self.current_bankroll,
-                    'last_updated': datetime.now().isoformat()
-                }, f, indent=2)
+            if ORJSON_AVAILABLE:
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps(data))
+            else:
+                with open(tmp_file, 'w') as f:
+                    json.dump(data, f)
+            os.replace(tmp_file, self.bankroll_file)
         except Exception as e:
             print(f"Error saving bankroll: {e}")
     
+    def _encode_record(self, record: Union[TradeRecord, SkipRecord, Dict]) -> bytes:
+        """Encode one journal record in the configured format."""
+        if self.log_format == LOG_FORMAT_MSGPACK:
+            if is_dataclass(record):
+                record = asdict(record)
+            payload = msgpack.packb(record)
+            return len(payload).to_bytes(4, 'little') + payload
+        if ORJSON_AVAILABLE:
+            # orjson serializes dataclasses natively
+            return orjson.dumps(record) + b'\n'
+        if is_dataclass(record):
+            record = asdict(record)
+        return json.dumps(record).encode() + b'\n'
+    
+    def _iter_journal_lines(self):
+        """Yield raw journal lines as bytes, without line terminators."""
+        with open(self.log_file, 'rb') as f:
+            if os.path.getsize(self.log_file) > STREAM_THRESHOLD_BYTES:
+                lines = f
+            else:
+                lines = f.read().splitlines(keepends=True)
+            for line in lines:
+                if not line.endswith(b'\n'):
+                    # Only a final append cut short by a crash lacks its terminator
+                    self._journal_damaged = True
+                yield line.rstrip(b'\r\n')
+    
+    def _iter_journal_frames(self):
+        """Yield decoded records from a length-prefixed MessagePack journal."""
+        with open(self.log_file, 'rb') as f:
+            frame_no = 0
+            while True:
+                header = f.read(4)
+                if not header:
+                    return
+                frame_no += 1
+                size = int.from_bytes(header, 'little')
+                payload = f.read(size) if len(header) == 4 else b''
+                if len(header) < 4 or len(payload) < size:
+                    # An append cut short by a crash; nothing after it is framed
+                    self._journal_damaged = True
+                    print(f"Journal frame {frame_no} is incomplete; stopping there")
+                    return
+                # A corrupt frame costs only itself; its length still frames the next one
+                try:
+                    record = msgpack.unpackb(payload)
+                except Exception as e:
+                    record = None
+                    print(f"Skipping unreadable journal frame {frame_no}: {e}")
+                if isinstance(record, dict):
+                    yield record
+                else:
+                    self._journal_damaged = True
+    
+    def _iter_journal_records(self):
+        """Yield decoded journal records in file order."""
+        if self.log_format == LOG_FORMAT_MSGPACK:
+            yield from self._iter_journal_frames()
+            return
+        
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+        for line_no, line in enumerate(self._iter_journal_lines(), 1):
+            if not line:
+                continue
+            # A torn or corrupt line costs only itself, not the records around it
+            try:
+                record = loads(line)
+            except ValueError as e:
+                record = None
+                print(f"Skipping unreadable journal line {line_no}: {e}")
+            if isinstance(record, dict):
+                yield record
+            else:
+                self._journal_damaged = True
+    
+    def _read_journal(self) -> List[Dict]:
+        """
+        Replay the journal into its current state.
+        
+        UPDATE records are applied to the trade they reference and dropped,
+        so the result is the list of trades/skips in original order.
+        """
+        records = []
+        by_id = {}
+        self._pending_updates = 0
+        self._journal_damaged = False
+        
+        if not os.path.exists(self.log_file):
+            return records
+        
+        for record in self._iter_journal_records():
+            if record.get('type') == 'UPDATE':
+                self._pending_updates += 1
+                trade = by_id.get(record.get('trade_id'))
+                if trade is not None:
+                    trade['status'] = record['status']
+                    trade['outcome'] = record['outcome']
+                    trade['pnl'] = record['pnl']
+                continue
+            
+            if 'trade_id' in record:
+                by_id[record['trade_id']] = record
+            records.append(record)
+        
+        return records
+    
     def _load_trades(self):
         """Load trades from log file on startup."""
         try:
-            if os.path.exists(self.log_file):
-                with open(self.log_file, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            trade = json.loads(line)
-                            self.trades.append(trade)
+            records = self._read_journal()
         except Exception as e:
             print(f"Error loading trades: {e}")
+            return
+        
+        for record in records:
+            try:
+                loaded = _record_from_dict(record)
+            except TypeError as e:
+                print(f"Skipping malformed journal record: {e}")
+                continue
+            self._add_record(loaded)
+        
+        if self._journal_damaged:
+            # Drop the unreadable bytes so new appends start on a record boundary
+            print("Journal had unreadable records; rewriting it without them")
+            self._compact_trades_file(records)
+    
+    def _add_row(self, trade: TradeRecord):
+        """Append a trade to the columnar history, doubling capacity when full."""
+        if self._n == len(self._pnl_arr):
+            capacity = 2 * len(self._pnl_arr)
+            for name in ('_pnl_arr', '_size_arr', '_status_arr'):
+                old = getattr(self, name)
+                grown = np.zeros(capacity, dtype=old.dtype)
+                grown[:self._n] = old
+                setattr(self, name, grown)
+        
+        row = self._n
+        self._pnl_arr[row] = trade.pnl or 0.0
+        self._size_arr[row] = trade.size or 0.0
+        self._status_arr[row] = STATUS_CODES.get(trade.status, STATUS_OTHER)
+        self._row_by_id[trade.trade_id] = row
+        self._n += 1
+    
+    def _add_record(self, record: Union[TradeRecord, SkipRecord]):
+        """Append to the in-memory window and, for trades, the columnar history."""
+        if len(self.trades) == self.trades.maxlen:
+            evicted = self.trades[0]
+            if isinstance(evicted, TradeRecord):
+                self._by_id.pop(evicted.trade_id, None)
+        
+        self.trades.append(record)
+        self.version += 1
+        if isinstance(record, TradeRecord):
+            self._by_id[record.trade_id] = record
+            if record.status == 'OPEN':
+                self._open_by_id[record.trade_id] = record
+            self._add_row(record)
     
     def log_trade(
         self,
@@ -89,26 +382,24 @@ class TradeLogger:
         
         Returns: trade_id for later outcome updates
         """
-        trade_id = f"T{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        # Counter suffix keeps ids unique even within the same nanosecond
+        trade_id = f"T{time.time_ns()}_{next(self._trade_counter)}"
         
-        trade = {
-            'trade_id': trade_id,
-            'timestamp': datetime.now().isoformat(),
-            'market_id': market_id,
-            'market_question': market_question[:60] + '...' if len(market_question) > 60 else market_question,
-            'direction': direction,
-            'size': round(size, 2),
-            'price': round(price, 4),
-            'edge': round(edge * 100, 2),  # Store as percentage
-            'confidence': round(confidence * 100, 2),
-            'whale_signal': round(whale_signal, 4),
-            'momentum_signal': round(momentum_signal, 4),
-            'status': 'OPEN',  # OPEN, WON, LOST, CANCELLED
-            'outcome': None,
-            'pnl': None
-        }
+        trade = TradeRecord(
+            trade_id=trade_id,
+            timestamp=datetime.now().isoformat(),
+            market_id=market_id,
+            market_question=_truncate(market_question),
+            direction=direction,
+            size=round(size, 2),
+            price=round(price, 4),
+            edge=round(edge * 100, 2),  # Store as percentage
+            confidence=round(confidence * 100, 2),
+            whale_signal=round(whale_signal, 4),
+            momentum_signal=round(momentum_signal, 4)
+        )
         
-        self.trades.append(trade)
+        self._add_record(trade)
         self._append_to_file(trade)
         
         # Deduct size from bankroll
@@ -119,92 +410,172 @@ class TradeLogger:
     
     def log_outcome(self, trade_id: str, won: bool, pnl: float):
         """Update a trade with its outcome after market resolution."""
-        for trade in self.trades:
-            if trade['trade_id'] == trade_id:
-                trade['status'] = 'WON' if won else 'LOST'
-                trade['outcome'] = 'WON' if won else 'LOST'
-                trade['pnl'] = round(pnl, 2)
-                
-                # Update bankroll
-                if won:
-                    # Return size + profit
-                    self.current_bankroll += trade['size'] + pnl
-                # If lost, size was already deducted
-                
-                self._save_bankroll()
-                self._rewrite_trades_file()
-                break
+        row = self._row_by_id.get(trade_id)
+        if row is None:
+            return
+        
+        status = 'WON' if won else 'LOST'
+        pnl = round(pnl, 2)
+        self._status_arr[row] = STATUS_WON if won else STATUS_LOST
+        self._pnl_arr[row] = pnl
+        
+        # Resolved trades older than the in-memory window only live in the columns
+        trade = self._open_by_id.pop(trade_id, None) or self._by_id.get(trade_id)
+        if trade is not None:
+            trade.status = status
+            trade.outcome = status
+            trade.pnl = pnl
+        self.version += 1
+        
+        # Update bankroll
+        if won:
+            # Return size + profit
+            self.current_bankroll += float(self._size_arr[row]) + pnl
+        # If lost, size was already deducted
+        
+        self._save_bankroll()
+        self._append_to_file({
+            'trade_id': trade_id,
+            'type': 'UPDATE',
+            'status': status,
+            'outcome': status,
+            'pnl': pnl
+        })
+        
+        self._pending_updates += 1
+        if self._pending_updates >= COMPACT_EVERY:
+            self._compact_trades_file()
     
     def log_skip(self, market_question: str, reason: str):
         """Log a skipped trade opportunity with reason."""
-        skip_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'type': 'SKIP',
-            'market_question': market_question[:60] + '...' if len(market_question) > 60 else market_question,
-            'reason': reason
-        }
+        skip_entry = SkipRecord(
+            timestamp=datetime.now().isoformat(),
+            market_question=_truncate(market_question),
+            reason=reason
+        )
         
-        self.trades.append(skip_entry)
+        self._add_record(skip_entry)
         self._append_to_file(skip_entry)
     
-    def _append_to_file(self, trade: Dict):
-        """Append a single trade to the log file."""
-        try:
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(trade) + '\n')
-        except Exception as e:
-            print(f"Error writing trade: {e}")
+    def _append_to_file(self, trade: Union[TradeRecord, SkipRecord, Dict]):
+        """Queue a single trade for the writer thread."""
+        # Encode now so later mutations (outcomes) don't leak into this record
+        self._write_queue.put(self._encode_record(trade))
+        self._write_wake.set()
     
-    def _rewrite_trades_file(self):
-        """Rewrite entire trades file (for updates)."""
-        try:
-            with open(self.log_file, 'w') as f:
-                for trade in self.trades:
-                    f.write(json.dumps(trade) + '\n')
-        except Exception as e:
-            print(f"Error rewriting trades: {e}")
+    def _writer_loop(self):
+        """Background thread: write queued records in batches."""
+        while True:
+            self._write_wake.wait()
+            time.sleep(WRITE_BATCH_SECONDS)
+            self._write_wake.clear()
+            self.flush()
+    
+    def flush(self):
+        """Write every queued record to the journal in one call."""
+        with self._write_lock:
+            batch = []
+            try:
+                while True:
+                    batch.append(self._write_queue.get_nowait())
+            except queue.Empty:
+                pass
+            if not batch:
+                return
+            try:
+                if self._log_fd is None:
+                    self._log_fd = os.open(self.log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                data = memoryview(b''.join(batch))
+                while data:
+                    data = data[os.write(self._log_fd, data):]
+            except Exception as e:
+                print(f"Error writing trades: {e}")
+    
+    def _close_log_fd(self):
+        """Close the journal descriptor (caller holds the write lock)."""
+        if self._log_fd is not None:
+            os.close(self._log_fd)
+            self._log_fd = None
+    
+    def close(self):
+        """Flush queued records and release the journal descriptor."""
+        self.flush()
+        with self._write_lock:
+            self._close_log_fd()
+    
+    def _compact_trades_file(self, records: Optional[List[Dict]] = None):
+        """
+        Rewrite the journal with UPDATE records folded into their trades.
+        
+        `records` is an already-replayed journal to write instead of reading it again.
+        """
+        tmp_file = self.log_file + '.tmp'
+        self.flush()
+        with self._write_lock:
+            try:
+                if records is None:
+                    records = self._read_journal()
+                with open(tmp_file, 'wb') as f:
+                    f.write(b''.join(self._encode_record(record) for record in records))
+                os.replace(tmp_file, self.log_file)
+                # The old descriptor still points at the replaced file
+                self._close_log_fd()
+                self._pending_updates = 0
+                self._journal_damaged = False
+            except Exception as e:
+                print(f"Error compacting trades: {e}")
     
     def get_recent_trades(self, n: int = 10) -> List[Dict]:
         """Get the last N trades (excluding skips)."""
-        trades = [t for t in self.trades if t.get('type') != 'SKIP']
-        return list(trades)[-n:]
+        recent = []
+        if n <= 0:
+            return recent
+        for t in reversed(self.trades):
+            if isinstance(t, TradeRecord):
+                recent.append(t.to_dict())
+                if len(recent) == n:
+                    break
+        recent.reverse()
+        return recent
     
     def get_recent_activity(self, n: int = 10) -> List[Dict]:
         """Get the last N activities (including skips)."""
-        return list(self.trades)[-n:]
+        if n <= 0:
+            return []
+        return [t.to_dict() for t in itertools.islice(self.trades, max(len(self.trades) - n, 0), None)]
+    
+    def get_dashboard_bundle(self, n: int = 10) -> Dict[str, Any]:
+        """Stats plus the last N activities, newest first, in one call."""
+        return {
+            'stats': self.get_stats(),
+            'recent_activity': [t.to_dict() for t in itertools.islice(reversed(self.trades), n)]
+        }
     
     def get_open_positions(self) -> List[Dict]:
         """Get all trades that are still open (unresolved)."""
-        return [t for t in self.trades if t.get('status') == 'OPEN']
+        return [t.to_dict() for t in self._open_by_id.values()]
     
     def get_total_pnl(self) -> float:
         """Calculate total realized PnL from all resolved trades."""
-        total = 0.0
-        for trade in self.trades:
-            if trade.get('pnl') is not None:
-                total += trade['pnl']
-        return round(total, 2)
+        return round(float(self._pnl_arr[:self._n].sum()), 2)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get trading statistics."""
-        resolved = [t for t in self.trades if t.get('status') in ['WON', 'LOST']]
-        wins = len([t for t in resolved if t.get('status') == 'WON'])
-        losses = len([t for t in resolved if t.get('status') == 'LOST'])
-        
-        total_pnl = 0.0
-        for trade in self.trades:
-            if trade.get('pnl') is not None:
-                total_pnl += trade['pnl']
+        # One pass over the status column yields every per-status count
+        counts = np.bincount(self._status_arr[:self._n], minlength=len(STATUS_CODES) + 1)
+        wins = int(counts[STATUS_WON])
+        losses = int(counts[STATUS_LOST])
+        resolved = wins + losses
         
         return {
             'initial_bankroll': self.initial_bankroll,
             'current_bankroll': round(self.current_bankroll, 2),
-            'total_pnl': round(total_pnl, 2),
-            'total_trades': len([t for t in self.trades if t.get('type') != 'SKIP']),
-            'open_positions': len([t for t in self.trades if t.get('status') == 'OPEN']),
+            'total_pnl': round(float(self._pnl_arr[:self._n].sum()), 2),
+            'total_trades': self._n,
+            'open_positions': int(counts[STATUS_OPEN]),
             'wins': wins,
             'losses': losses,
-            'win_rate': round(wins / len(resolved) * 100, 1) if resolved else 0.0
+            'win_rate': round(wins / resolved * 100, 1) if resolved else 0.0
         }
 
 
@@ -242,3 +613,26 @@ def log_outcome(trade_id: str, won: bool, pnl: float):
 def get_stats() -> Dict[str, Any]:
     """Convenience function to get stats."""
     return get_trade_logger().get_stats()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Trade journal tools")
+    parser.add_argument("log_file", nargs="?", default="bot_trades.log", help="Journal to read")
+    parser.add_argument("--format", default=LOG_FORMAT_JSONL,
+                        choices=[LOG_FORMAT_JSONL, LOG_FORMAT_MSGPACK], help="Journal encoding")
+    parser.add_argument("--export-json", action="store_true",
+                        help="Print the replayed journal as JSON lines")
+    args = parser.parse_args()
+    
+    trade_logger = TradeLogger(log_file=args.log_file, log_format=args.format)
+    if args.export_json:
+        for record in trade_logger._read_journal():
+            print(json.dumps(record))
+    else:
+        print(json.dumps(trade_logger.get_stats(), indent=2))
@@ -15,16 +15,19 @@ Usage:
 """
 
 import argparse
+import asyncio
 import logging
 import signal as sig
 import sys
 import time
 import uuid
-from datetime import datetime
 from typing import Optional, List, Dict, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from config import Config
+from _fusion_jit import ACTION_HOLD, ACTION_NAMES, fuse_arrays, fuse_kernel
 from price_feed import PriceFeed, MomentumSignal
 from market_finder import MarketFinder, CryptoMarket
 from position_manager import PositionManager, Trade
@@ -66,7 +69,7 @@ def setup_logging(log_file: str = "bot.log", level: str = "INFO"):
 # SIGNAL FUSION
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FusedSignal:
     """Combined signal from multiple sources."""
     market: CryptoMarket
@@ -87,16 +90,28 @@ class FusedSignal:
     # Recommended action
     action: str               # "BUY_YES", "BUY_NO", "HOLD"
     
+    # Minimum edge in force when the signal was fused
+    edge_threshold: float
+    
+    # Execution terms resolved at fusion time
+    entry_price: float        # Price of the token the action buys
+    size_multiplier: float    # Position size boost (whale conviction)
+    
     @property
     def should_trade(self) -> bool:
         """Check if signal meets trading thresholds."""
         return (
             self.confidence >= 0.5 and
-            self.edge >= Config.trading.edge_threshold and
+            self.edge >= self.edge_threshold and
             self.action != "HOLD"
         )
 
 
+# Whale confidence above this boosts position size
+WHALE_SIZE_BOOST_CONFIDENCE = 0.7
+WHALE_SIZE_BOOST = 1.5
+
+
 class SignalFusion:
     """
     Fuses momentum and whale signals using weighted average.
@@ -113,6 +128,19 @@ class SignalFusion:
     ):
         self.momentum_weight = momentum_weight
         self.whale_weight = whale_weight
+        self.edge_threshold = Config.trading.edge_threshold
+    
+    @staticmethod
+    def _execution_terms(
+        market: CryptoMarket,
+        action: str,
+        whale: Optional[AggregatedSignal]
+    ) -> Tuple[float, float]:
+        """Entry price and size multiplier for executing an action."""
+        entry_price = market.yes_price if action == "BUY_YES" else market.no_price
+        if whale and whale.confidence > WHALE_SIZE_BOOST_CONFIDENCE:
+            return entry_price, WHALE_SIZE_BOOST
+        return entry_price, 1.0
     
     def fuse(
         self,
@@ -128,12 +156,12 @@ class SignalFusion:
         momentum_confidence = 0.0
         
         if momentum:
-            # Momentum: positive change = bullish if market asks about UP
-            if market.direction == momentum.direction:
-                momentum_direction = momentum.predicted_probability - 0.5
-            else:
-                momentum_direction = 0.5 - momentum.predicted_probability
-            momentum_direction *= 2  # Scale to [-1, 1]
+            # Momentum: positive change = bullish if market asks about UP,
+            # scaled to [-1, 1]
+            momentum_direction = (
+                (momentum.predicted_probability - 0.5)
+                * market.direction_sign * momentum.direction_sign * 2
+            )
             momentum_confidence = momentum.confidence
         
         whale_direction = 0.0
@@ -147,71 +175,115 @@ class SignalFusion:
         if momentum and whale:
             mw = self.momentum_weight
             ww = self.whale_weight
-        elif momentum:
-            mw = 1.0
-            ww = 0.0
-        elif whale:
-            mw = 0.0
-            ww = 1.0
         else:
-            # No signals
-            return FusedSignal(
-                market=market,
-                momentum_signal=momentum,
-                whale_signal=whale,
-                direction=0.0,
-                confidence=0.0,
-                edge=0.0,
-                momentum_weight=0.0,
-                whale_weight=0.0,
-                action="HOLD"
-            )
-        
-        # Weighted average of directions
-        total_weight = mw + ww
-        fused_direction = (
-            momentum_direction * mw + whale_direction * ww
-        ) / total_weight
+            mw = 1.0 if momentum else 0.0
+            ww = 1.0 if whale else 0.0
+        total_weight = (mw + ww) or 1.0
+        
+        direction, confidence, edge, action = fuse_kernel(
+            momentum_direction, momentum_confidence,
+            whale_direction, whale_confidence,
+            market.yes_price, mw, ww,
+            bool(momentum and whale), self.edge_threshold
+        )
         
-        # Confidence is min of available confidences (conservative)
-        # or weighted average
-        fused_confidence = (
-            momentum_confidence * mw + whale_confidence * ww
-        ) / total_weight
-        
-        # Boost confidence if signals agree
-        if momentum and whale:
-            if (momentum_direction > 0) == (whale_direction > 0):
-                # Signals agree - boost confidence
-                fused_confidence = min(1.0, fused_confidence * 1.2)
-            else:
-                # Signals disagree - reduce confidence
-                fused_confidence *= 0.7
-        
-        # Calculate edge
-        # Edge = predicted prob - market prob
-        predicted_prob = 0.5 + (fused_direction * 0.5)  # Convert to 0-1
-        edge = abs(predicted_prob - market.yes_price)
-        
-        # Determine action
-        if fused_direction > 0.1 and edge >= Config.trading.edge_threshold:
-            action = "BUY_YES"
-        elif fused_direction < -0.1 and edge >= Config.trading.edge_threshold:
-            action = "BUY_NO"
-        else:
-            action = "HOLD"
+        action = ACTION_NAMES[action]
+        entry_price, size_multiplier = self._execution_terms(market, action, whale)
         
         return FusedSignal(
             market=market,
             momentum_signal=momentum,
             whale_signal=whale,
-            direction=fused_direction,
-            confidence=fused_confidence,
-            edge=edge,
+            direction=float(direction),
+            confidence=float(confidence),
+            edge=float(edge),
             momentum_weight=mw / total_weight,
             whale_weight=ww / total_weight,
-            action=action
+            action=action,
+            edge_threshold=self.edge_threshold,
+            entry_price=entry_price,
+            size_multiplier=size_multiplier
+        )
+    
+    def fuse_all(
+        self,
+        markets: List[CryptoMarket],
+        momentum_by_coin: Dict[str, MomentumSignal],
+        whale_signals: Dict[str, AggregatedSignal]
+    ) -> List[FusedSignal]:
+        """
+        Fuse signals for many markets at once with NumPy column arrays.
+        
+        Same arithmetic as fuse(), but only signals that pass
+        should_trade are materialized.
+        """
+        # Markets with neither signal can only HOLD, so drop them up front
+        candidates, moms, whales = [], [], []
+        for market in markets:
+            momentum = momentum_by_coin.get(market.coin_id)
+            whale = whale_signals.get(market.market_id)
+            if momentum is None and whale is None:
+                continue
+            candidates.append(market)
+            moms.append(momentum)
+            whales.append(whale)
+        markets = candidates
+        
+        n = len(markets)
+        if n == 0:
+            return []
+        
+        # Unpack inputs into column arrays (0.0 where a signal is missing)
+        has_m = np.fromiter((s is not None for s in moms), dtype=bool, count=n)
+        has_w = np.fromiter((s is not None for s in whales), dtype=bool, count=n)
+        m_prob = np.fromiter(
+            (s.predicted_probability - 0.5 if s else 0.0 for s in moms), dtype=np.float64, count=n
         )
+        m_sign = np.fromiter(
+            (m.direction_sign * s.direction_sign if s else 0 for m, s in zip(markets, moms)),
+            dtype=np.int8, count=n
+        )
+        m_conf = np.fromiter((s.confidence if s else 0.0 for s in moms), dtype=np.float64, count=n)
+        w_dir = np.fromiter((s.direction if s else 0.0 for s in whales), dtype=np.float64, count=n)
+        w_conf = np.fromiter((s.confidence if s else 0.0 for s in whales), dtype=np.float64, count=n)
+        yes_price = np.fromiter((m.yes_price for m in markets), dtype=np.float64, count=n)
+        
+        # Momentum direction relative to the market's question, scaled to [-1, 1]
+        m_dir = m_prob * m_sign * 2
+        
+        # Weights (normalized when one source is missing)
+        both = has_m & has_w
+        mw = np.where(both, self.momentum_weight, has_m.astype(np.float64))
+        ww = np.where(both, self.whale_weight, has_w.astype(np.float64))
+        
+        direction, confidence, edge, action = fuse_arrays(
+            m_dir, m_conf, w_dir, w_conf, yes_price, mw, ww, both,
+            self.edge_threshold
+        )
+        total_weight = mw + ww
+        
+        # A non-HOLD action already implies the edge threshold was met
+        tradeable = (confidence >= 0.5) & (action != ACTION_HOLD)
+        
+        signals = []
+        for i in np.flatnonzero(tradeable):
+            action_name = ACTION_NAMES[action[i]]
+            entry_price, size_multiplier = self._execution_terms(markets[i], action_name, whales[i])
+            signals.append(FusedSignal(
+                market=markets[i],
+                momentum_signal=moms[i],
+                whale_signal=whales[i],
+                direction=float(direction[i]),
+                confidence=float(confidence[i]),
+                edge=float(edge[i]),
+                momentum_weight=float(mw[i] / total_weight[i]),
+                whale_weight=float(ww[i] / total_weight[i]),
+                action=action_name,
+                edge_threshold=self.edge_threshold,
+                entry_price=entry_price,
+                size_multiplier=size_multiplier
+            ))
+        return signals
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -249,11 +321,11 @@ class UnifiedTradingBot:
         # Stats
         self.signals_generated = 0
         self.trades_executed = 0
-        self.start_time = datetime.utcnow()
+        self._start_ts = time.monotonic()
         
         # Cache
         self.whale_signals: Dict[str, AggregatedSignal] = {}
-        self.last_whale_refresh = None
+        self._last_whale_refresh_ts: Optional[float] = None
     
     def print_banner(self):
         """Print startup banner."""
@@ -283,50 +355,41 @@ class UnifiedTradingBot:
         )
         
         self.whale_signals = {s.market_id: s for s in signals}
-        self.last_whale_refresh = datetime.utcnow()
+        self._last_whale_refresh_ts = time.monotonic()
         
-        self.logger.info(f"Loaded {len(signals)} whale signals")
+        self.logger.info("Loaded %d whale signals", len(signals))
     
-    def find_opportunities(self) -> List[FusedSignal]:
+    def find_opportunities(self, markets: Optional[List[CryptoMarket]] = None) -> List[FusedSignal]:
         """Find trading opportunities using fused signals."""
-        opportunities = []
+        # Momentum signals are kept current by fetch_prices
+        momentum_by_coin = self.price_feed.signals_by_coin
         
-        # Get momentum signals
-        momentum_signals = self.price_feed.get_all_signals()
-        momentum_by_coin = {s.coin_id: s for s in momentum_signals}
-        
-        # Get current markets
-        markets = self.market_finder.find_crypto_markets(min_minutes_left=3.0)
+        # Get current markets (unless the caller already fetched them)
+        if markets is None:
+            markets = self.market_finder.find_crypto_markets(min_minutes_left=3.0)
         
         if not markets:
             return []
         
-        for market in markets:
-            # Skip if we have position
-            if self.position_manager.has_position(market.market_id):
-                continue
-            
-            # Get momentum signal for this coin
-            momentum = momentum_by_coin.get(market.coin_id)
-            
-            # Get whale signal for this market
-            whale = self.whale_signals.get(market.market_id)
-            
-            # Fuse signals
-            fused = self.fusion.fuse(market, momentum, whale)
-            
-            if fused.should_trade:
-                opportunities.append(fused)
-                self.signals_generated += 1
-        
-        # Sort by edge * confidence (expected value)
-        opportunities.sort(
-            key=lambda f: f.edge * f.confidence,
-            reverse=True
-        )
+        # Skip markets where we already have a position
+        held = self.position_manager.get_open_market_ids()
+        markets = [m for m in markets if m.market_id not in held]
+        
+        # Fuse momentum + whale signals for every market in one batch
+        opportunities = self.fusion.fuse_all(markets, momentum_by_coin, self.whale_signals)
+        self.signals_generated += len(opportunities)
         
         return opportunities
     
+    @staticmethod
+    def _expected_value(fused: FusedSignal) -> float:
+        """Ranking key for opportunities: edge * confidence."""
+        return fused.edge * fused.confidence
+    
+    def best_opportunity(self, opportunities: List[FusedSignal]) -> Optional[FusedSignal]:
+        """Highest expected-value opportunity, found in a single pass."""
+        return max(opportunities, key=self._expected_value, default=None)
+    
     def execute_opportunity(self, fused: FusedSignal) -> Optional[Trade]:
         """Execute a fused trading signal."""
         market = fused.market
@@ -334,28 +397,18 @@ class UnifiedTradingBot:
         # Risk checks
         can_trade, reason = self.position_manager.can_trade()
         if not can_trade:
-            self.logger.warning(f"Cannot trade: {reason}")
+            self.logger.warning("Cannot trade: %s", reason)
             return None
         
-        # Calculate position size
-        # Boost size if whale confidence is high
+        # Calculate position size (boosted at fusion time if whale confidence is high)
         base_size = self.position_manager.calculate_position_size()
-        
-        if fused.whale_signal and fused.whale_signal.confidence > 0.7:
-            size = min(base_size * 1.5, Config.trading.max_position_usd)
-        else:
-            size = base_size
+        size = min(base_size * fused.size_multiplier, Config.trading.max_position_usd)
         
         if size < 1.0:
             return None
         
-        # Determine token
-        if fused.action == "BUY_YES":
-            token_id = "yes"
-            entry_price = market.yes_price
-        else:
-            token_id = "no"
-            entry_price = market.no_price
+        token_id = "yes" if fused.action == "BUY_YES" else "no"
+        entry_price = fused.entry_price
         
         # Place order
         order = OrderRequest(
@@ -368,7 +421,7 @@ class UnifiedTradingBot:
         result = self.executor.place_order(order)
         
         if not result.success:
-            self.logger.error(f"Order failed: {result.error}")
+            self.logger.error("Order failed: %s", result.error)
             return None
         
         self.trades_executed += 1
@@ -402,44 +455,57 @@ class UnifiedTradingBot:
         
         return trade
     
+    def _whale_refresh_due(self) -> bool:
+        """Whale signals are refreshed every 10 minutes."""
+        return (
+            self._last_whale_refresh_ts is None or
+            time.monotonic() - self._last_whale_refresh_ts > 600
+        )
+    
+    async def _fetch_cycle_inputs(self) -> Tuple[Dict[str, float], List[CryptoMarket]]:
+        """
+        Fetch prices, markets and (when due) whale signals concurrently.
+        
+        The clients are blocking, so each call runs in a worker thread.
+        """
+        whale_refresh = (
+            asyncio.to_thread(self.refresh_whale_signals)
+            if self._whale_refresh_due() else asyncio.sleep(0)
+        )
+        prices, _, markets = await asyncio.gather(
+            asyncio.to_thread(self.price_feed.fetch_prices),
+            whale_refresh,
+            asyncio.to_thread(self.market_finder.find_crypto_markets, min_minutes_left=3.0)
+        )
+        return prices, markets
+    
     def run_cycle(self) -> int:
         """Run one trading cycle."""
         self.cycle_count += 1
-        self.logger.info(f"─── Cycle {self.cycle_count} ───")
+        self.logger.info("─── Cycle %d ───", self.cycle_count)
         
-        # 1. Update prices
-        prices = self.price_feed.fetch_prices()
+        # 1. Update prices, whale signals and markets in parallel
+        prices, markets = asyncio.run(self._fetch_cycle_inputs())
         if not prices:
             self.logger.warning("Failed to fetch prices")
             return 0
         
-        # 2. Refresh whale signals periodically (every 10 minutes)
-        if (
-            self.last_whale_refresh is None or
-            (datetime.utcnow() - self.last_whale_refresh).seconds > 600
-        ):
-            self.refresh_whale_signals()
-        
-        # 3. Find opportunities
-        opportunities = self.find_opportunities()
-        self.logger.info(f"Found {len(opportunities)} opportunities")
+        # 2. Find opportunities
+        opportunities = self.find_opportunities(markets)
+        self.logger.info("Found %d opportunities", len(opportunities))
         
-        if not opportunities:
+        opp = self.best_opportunity(opportunities)
+        if opp is None:
             return 0
         
-        # 4. Execute best opportunity
-        trades = 0
-        for opp in opportunities[:1]:
-            self.logger.info(
-                f"Signal: {opp.market.coin_symbol} {opp.action} | "
-                f"Edge: {opp.edge*100:.1f}% | Conf: {opp.confidence:.1%} | "
-                f"Dir: {opp.direction:+.2f}"
-            )
-            
-            if self.execute_opportunity(opp):
-                trades += 1
+        # 3. Execute best opportunity
+        self.logger.info(
+            "Signal: %s %s | Edge: %.1f%% | Conf: %.1f%% | Dir: %+.2f",
+            opp.market.coin_symbol, opp.action,
+            opp.edge * 100, opp.confidence * 100, opp.direction
+        )
         
-        return trades
+        return 1 if self.execute_opportunity(opp) else 0
     
     def run(self, max_cycles: int = None):
         """Main bot loop."""
@@ -457,7 +523,7 @@ class UnifiedTradingBot:
         self.refresh_whale_signals()
         self.position_manager.print_status()
         
-        self.logger.info(f"Starting unified trading loop...")
+        self.logger.info("Starting unified trading loop...")
         
         try:
             while self.running:
@@ -472,13 +538,13 @@ class UnifiedTradingBot:
                     
                     can_trade, reason = self.position_manager.can_trade()
                     if not can_trade:
-                        self.logger.warning(f"Stopping: {reason}")
+                        self.logger.warning("Stopping: %s", reason)
                         break
                     
                     time.sleep(Config.trading.scan_interval_seconds)
                     
                 except Exception as e:
-                    self.logger.error(f"Cycle error: {e}", exc_info=True)
+                    self.logger.error("Cycle error: %s", e, exc_info=True)
                     time.sleep(30)
         
         finally:
@@ -504,6 +570,7 @@ class UnifiedTradingBot:
         self.market_finder.print_markets()
         
         opportunities = self.find_opportunities()
+        opportunities.sort(key=self._expected_value, reverse=True)
         
         print(f"\n{'═' * 70}")
         print(f"🎯 FUSED TRADING SIGNALS")
@@ -524,7 +591,7 @@ class UnifiedTradingBot:
     
     def print_summary(self):
         """Print session summary."""
-        duration = (datetime.utcnow() - self.start_time).total_seconds() / 60
+        duration = (time.monotonic() - self._start_ts) / 60
         stats = self.position_manager.get_session_stats()
         
         print(f"\n{'═' * 70}")
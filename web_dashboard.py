@@ -4,20 +4,64 @@ Polymarket Trading Bot - Web Dashboard
 Simple Flask web interface showing bot status, strategy explanation, and math.
 
 Access at http://178.156.208.100:8080
+
+Production: gunicorn -w 1 -k gthread --threads 8 -b 0.0.0.0:8080 web_dashboard:app
+(one worker: the price, status and whale caches are per process)
 """
 
-from flask import Flask, render_template_string, jsonify
+from flask import Flask, Response, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+import concurrent.futures
+import hashlib
 import json
 import os
+import subprocess
+import threading
+import time
 from datetime import datetime
 
+from jinja2 import DictLoader, FileSystemBytecodeCache
+from markupsafe import Markup, escape
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
 # Import trade logger for live stats
 try:
     from trade_logger import get_trade_logger
 except ImportError:
     get_trade_logger = None
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """jsonify via orjson; parsing and unsupported types use Flask's defaults."""
+    
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
+
+# gzip/br the HTML, CSS and JSON when flask-compress is installed
+if COMPRESS_AVAILABLE:
+    app.config['COMPRESS_MIMETYPES'] = ['text/html', 'text/css', 'application/json']
+    app.config['COMPRESS_LEVEL'] = 6
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    Compress(app)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # DASHBOARD TEMPLATE
@@ -29,254 +73,8 @@ DASHBOARD_HTML = """
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta http-equiv="refresh" content="30">
     <title>🐳 Polymarket Trading Bot</title>
-    <style>
-        :root {
-            --bg-primary: #0a0a0f;
-            --bg-secondary: #12121a;
-            --bg-card: #1a1a25;
-            --accent: #00d4aa;
-            --accent-dim: #00a080;
-            --text-primary: #ffffff;
-            --text-secondary: #a0a0b0;
-            --border: #2a2a3a;
-            --success: #00ff88;
-            --warning: #ffaa00;
-            --danger: #ff4466;
-        }
-        
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'SF Mono', 'Consolas', monospace;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            min-height: 100vh;
-            line-height: 1.6;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 2rem;
-        }
-        
-        header {
-            text-align: center;
-            padding: 3rem 0;
-            border-bottom: 1px solid var(--border);
-            margin-bottom: 2rem;
-        }
-        
-        h1 {
-            font-size: 2.5rem;
-            color: var(--accent);
-            margin-bottom: 0.5rem;
-        }
-        
-        .subtitle {
-            color: var(--text-secondary);
-            font-size: 1.1rem;
-        }
-        
-        .grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
-            gap: 1.5rem;
-            margin-bottom: 2rem;
-        }
-        
-        .card {
-            background: var(--bg-card);
-            border: 1px solid var(--border);
-            border-radius: 12px;
-            padding: 1.5rem;
-        }
-        
-        .card h2 {
-            color: var(--accent);
-            font-size: 1.2rem;
-            margin-bottom: 1rem;
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-        }
-        
-        .card h3 {
-            color: var(--text-primary);
-            font-size: 1rem;
-            margin: 1rem 0 0.5rem;
-        }
-        
-        .card p, .card li {
-            color: var(--text-secondary);
-            font-size: 0.9rem;
-        }
-        
-        .card ul {
-            list-style: none;
-            padding-left: 0;
-        }
-        
-        .card li {
-            padding: 0.3rem 0;
-            padding-left: 1.5rem;
-            position: relative;
-        }
-        
-        .card li::before {
-            content: "→";
-            position: absolute;
-            left: 0;
-            color: var(--accent);
-        }
-        
-        .stat-row {
-            display: flex;
-            justify-content: space-between;
-            padding: 0.5rem 0;
-            border-bottom: 1px solid var(--border);
-        }
-        
-        .stat-label {
-            color: var(--text-secondary);
-        }
-        
-        .stat-value {
-            color: var(--accent);
-            font-weight: bold;
-        }
-        
-        .math-block {
-            background: var(--bg-secondary);
-            border: 1px solid var(--border);
-            border-radius: 8px;
-            padding: 1rem;
-            margin: 1rem 0;
-            font-family: 'Times New Roman', serif;
-            font-size: 1.1rem;
-            text-align: center;
-            color: var(--text-primary);
-        }
-        
-        .code-block {
-            background: var(--bg-secondary);
-            border: 1px solid var(--border);
-            border-radius: 8px;
-            padding: 1rem;
-            margin: 0.5rem 0;
-            font-size: 0.85rem;
-            overflow-x: auto;
-            color: var(--accent);
-        }
-        
-        .status-badge {
-            display: inline-block;
-            padding: 0.25rem 0.75rem;
-            border-radius: 20px;
-            font-size: 0.8rem;
-            font-weight: bold;
-        }
-        
-        .status-running {
-            background: rgba(0, 255, 136, 0.2);
-            color: var(--success);
-        }
-        
-        .status-stopped {
-            background: rgba(255, 68, 102, 0.2);
-            color: var(--danger);
-        }
-        
-        .whale-list {
-            margin-top: 1rem;
-        }
-        
-        .whale-item {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 0.5rem;
-            background: var(--bg-secondary);
-            border-radius: 6px;
-            margin-bottom: 0.5rem;
-            font-size: 0.85rem;
-        }
-        
-        .whale-addr {
-            font-family: monospace;
-            color: var(--accent);
-            text-decoration: none;
-        }
-        
-        .whale-addr:hover {
-            text-decoration: underline;
-            color: var(--success);
-        }
-        
-        .whale-profit {
-            color: var(--success);
-        }
-        
-        /* Trade log table styles */
-        .trade-table {
-            width: 100%;
-            border-collapse: collapse;
-            font-size: 0.8rem;
-            margin-top: 1rem;
-        }
-        
-        .trade-table th, .trade-table td {
-            padding: 0.5rem;
-            text-align: left;
-            border-bottom: 1px solid var(--border);
-        }
-        
-        .trade-table th {
-            color: var(--accent);
-            font-weight: bold;
-        }
-        
-        .pnl-positive { color: var(--success); }
-        .pnl-negative { color: var(--danger); }
-        .pnl-neutral { color: var(--text-secondary); }
-        
-        .bankroll-highlight {
-            font-size: 1.5rem;
-            color: var(--accent);
-            font-weight: bold;
-        }
-        
-        .big-number {
-            font-size: 1.3rem;
-            font-weight: bold;
-        }
-        
-        footer {
-            text-align: center;
-            padding: 2rem;
-            color: var(--text-secondary);
-            border-top: 1px solid var(--border);
-            margin-top: 2rem;
-        }
-        
-        @media (max-width: 768px) {
-            .container {
-                padding: 1rem;
-            }
-            h1 {
-                font-size: 1.8rem;
-            }
-            .grid {
-                grid-template-columns: 1fr;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{{ url_for('static', filename='dashboard.css', v=css_version) }}">
 </head>
 <body>
     <div class="container">
@@ -291,7 +89,7 @@ DASHBOARD_HTML = """
                 <h2>📊 Bot Status</h2>
                 <div class="stat-row">
                     <span class="stat-label">Status</span>
-                    <span class="status-badge {{ 'status-running' if status.running else 'status-stopped' }}">
+                    <span id="bot-status" class="status-badge {{ 'status-running' if status.running else 'status-stopped' }}">
                         {{ 'RUNNING' if status.running else 'STOPPED' }}
                     </span>
                 </div>
@@ -301,11 +99,11 @@ DASHBOARD_HTML = """
                 </div>
                 <div class="stat-row">
                     <span class="stat-label">Whales Tracked</span>
-                    <span class="stat-value">{{ status.whale_count }}</span>
+                    <span id="whale-count" class="stat-value">{{ status.whale_count }}</span>
                 </div>
                 <div class="stat-row">
                     <span class="stat-label">Last Refresh</span>
-                    <span class="stat-value">{{ status.last_update }}</span>
+                    <span id="last-update" class="stat-value">{{ status.last_update }}</span>
                 </div>
             </div>
             
@@ -313,30 +111,30 @@ DASHBOARD_HTML = """
             <div class="card">
                 <h2>💰 Live Bankroll</h2>
                 <div style="text-align: center; padding: 1rem 0;">
-                    <div class="bankroll-highlight">${{ "%.2f"|format(trading_stats.current_bankroll) }}</div>
+                    <div id="current-bankroll" class="bankroll-highlight">${{ trading_stats.current_bankroll_str }}</div>
                     <div style="font-size: 0.85rem; color: var(--text-secondary); margin-top: 0.5rem;">Current Balance</div>
                 </div>
                 <div class="stat-row">
                     <span class="stat-label">Starting</span>
-                    <span class="stat-value">${{ "%.2f"|format(trading_stats.initial_bankroll) }}</span>
+                    <span id="initial-bankroll" class="stat-value">${{ trading_stats.initial_bankroll_str }}</span>
                 </div>
                 <div class="stat-row">
                     <span class="stat-label">Total P&L</span>
-                    <span class="{{ 'pnl-positive' if trading_stats.total_pnl >= 0 else 'pnl-negative' }} big-number">
-                        {{ "+" if trading_stats.total_pnl >= 0 else "" }}${{ "%.2f"|format(trading_stats.total_pnl) }}
+                    <span id="pnl-total" class="{{ trading_stats.total_pnl_class }} big-number">
+                        {{ trading_stats.total_pnl_str }}
                     </span>
                 </div>
                 <div class="stat-row">
                     <span class="stat-label">Win Rate</span>
-                    <span class="stat-value">{{ trading_stats.win_rate }}%</span>
+                    <span id="win-rate" class="stat-value">{{ trading_stats.win_rate }}%</span>
                 </div>
                 <div class="stat-row">
                     <span class="stat-label">Trades (W/L)</span>
-                    <span class="stat-value">{{ trading_stats.wins }}/{{ trading_stats.losses }}</span>
+                    <span id="wins-losses" class="stat-value">{{ trading_stats.wins }}/{{ trading_stats.losses }}</span>
                 </div>
                 <div class="stat-row">
                     <span class="stat-label">Open Positions</span>
-                    <span class="stat-value">{{ trading_stats.open_positions }}</span>
+                    <span id="open-positions" class="stat-value">{{ trading_stats.open_positions }}</span>
                 </div>
             </div>
             
@@ -358,32 +156,7 @@ DASHBOARD_HTML = """
             <!-- Whales Tracked -->
             <div class="card">
                 <h2>🐋 Whales Tracked</h2>
-                <div class="whale-list">
-                    <div class="whale-item">
-                        <a href="https://polymarket.com/profile/0x63ce342161250d705dc0b16df89036c8e5f9ba9a" target="_blank" class="whale-addr">0x8dxd (Primary)</a>
-                        <span class="whale-profit">+$558k</span>
-                    </div>
-                    <div class="whale-item">
-                        <a href="https://polymarket.com/profile/0x9d84ce0306f8551e02efef1680475fc0f1dc1344" target="_blank" class="whale-addr">0x9d84...9344</a>
-                        <span class="whale-profit">+$2.6M</span>
-                    </div>
-                    <div class="whale-item">
-                        <a href="https://polymarket.com/profile/0xd218e474776403a330142299f7796e8ba32eb5c9" target="_blank" class="whale-addr">0xd218...b5c9</a>
-                        <span class="whale-profit">+$958k</span>
-                    </div>
-                    <div class="whale-item">
-                        <a href="https://polymarket.com/profile/0x006cc834cc092684f1b56626e23bedb3835c16ea" target="_blank" class="whale-addr">0x006c...16ea</a>
-                        <span class="whale-profit">+$1.48M</span>
-                    </div>
-                    <div class="whale-item">
-                        <a href="https://polymarket.com/profile/0xe74a4446efd66a4de690962938f550d8921a40ee" target="_blank" class="whale-addr">0xe74A...40Ee</a>
-                        <span class="whale-profit">+$434k</span>
-                    </div>
-                    <div class="whale-item">
-                        <a href="https://polymarket.com/profile/0x492442eab586f242b53bda933fd5de859c8a3782" target="_blank" class="whale-addr">0x4924...3782</a>
-                        <span class="whale-profit">+$1.42M</span>
-                    </div>
-                </div>
+                {{ whale_html }}
             </div>
             
             <!-- Math Section -->
@@ -461,16 +234,16 @@ DASHBOARD_HTML = """
                     <div style="background: var(--bg-secondary); border-radius: 8px; padding: 1rem; text-align: center;">
                         <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">{{ coin.icon }}</div>
                         <div style="font-weight: bold; color: var(--text-primary);">{{ coin.symbol }}</div>
-                        <div class="bankroll-highlight" style="font-size: 1.1rem;">${{ "%.2f"|format(coin.price) if coin.price < 1000 else "%.0f"|format(coin.price) }}</div>
+                        <div id="coin-{{ coin.symbol }}-price" class="bankroll-highlight" style="font-size: 1.1rem;">${{ coin.price_str }}</div>
                         <div style="margin-top: 0.5rem;">
-                            <span class="{{ 'pnl-positive' if coin.change >= 0 else 'pnl-negative' }}">
-                                {{ "+" if coin.change >= 0 else "" }}{{ "%.2f"|format(coin.change) }}%
+                            <span id="coin-{{ coin.symbol }}-change" class="{{ coin.change_class }}">
+                                {{ coin.change_str }}%
                             </span>
                             <span style="color: var(--text-secondary); font-size: 0.8rem;">15m</span>
                         </div>
                         <div style="margin-top: 0.3rem; font-size: 0.75rem; color: var(--text-secondary);">
-                            Signal: <span style="color: {{ 'var(--success)' if coin.momentum > 0 else 'var(--danger)' if coin.momentum < 0 else 'var(--text-secondary)' }};">
-                                {{ "↑ BULLISH" if coin.momentum > 0.5 else "↓ BEARISH" if coin.momentum < -0.5 else "→ NEUTRAL" }}
+                            Signal: <span id="coin-{{ coin.symbol }}-signal" style="color: {{ coin.signal_color }};">
+                                {{ coin.signal_label }}
                             </span>
                         </div>
                     </div>
@@ -557,43 +330,15 @@ DASHBOARD_HTML = """
                 <tbody>
                     {% for trade in recent_trades %}
                     <tr>
-                        <td>{{ trade.timestamp[:16] if trade.timestamp else '-' }}</td>
+                        <td>{{ trade.ts_short }}</td>
                         <td style="max-width: 200px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">
-                            {{ trade.market_question if trade.market_question else trade.reason if trade.type == 'SKIP' else '-' }}
-                        </td>
-                        <td>
-                            {% if trade.type == 'SKIP' %}
-                                <span style="color: var(--warning);">SKIP</span>
-                            {% else %}
-                                <span style="color: {{ 'var(--success)' if trade.direction == 'YES' else 'var(--danger)' }};">
-                                    {{ trade.direction }}
-                                </span>
-                            {% endif %}
-                        </td>
-                        <td>{{ "$%.2f"|format(trade.size) if trade.size else '-' }}</td>
-                        <td>{{ "%.1f%%"|format(trade.edge) if trade.edge else '-' }}</td>
-                        <td>
-                            {% if trade.status == 'OPEN' %}
-                                <span style="color: var(--accent);">OPEN</span>
-                            {% elif trade.status == 'WON' %}
-                                <span style="color: var(--success);">WON</span>
-                            {% elif trade.status == 'LOST' %}
-                                <span style="color: var(--danger);">LOST</span>
-                            {% elif trade.type == 'SKIP' %}
-                                <span style="color: var(--text-secondary);">-</span>
-                            {% else %}
-                                <span>{{ trade.status }}</span>
-                            {% endif %}
-                        </td>
-                        <td>
-                            {% if trade.pnl is not none %}
-                                <span class="{{ 'pnl-positive' if trade.pnl >= 0 else 'pnl-negative' }}">
-                                    {{ "+" if trade.pnl >= 0 else "" }}${{ "%.2f"|format(trade.pnl) }}
-                                </span>
-                            {% else %}
-                                -
-                            {% endif %}
+                            {{ trade.market_label }}
                         </td>
+                        <td><span class="{{ trade.side_class }}">{{ trade.side_label }}</span></td>
+                        <td>{{ trade.size_str }}</td>
+                        <td>{{ trade.edge_str }}</td>
+                        <td><span class="{{ trade.status_class }}">{{ trade.status_label }}</span></td>
+                        <td><span class="{{ trade.pnl_class }}">{{ trade.pnl_str }}</span></td>
                     </tr>
                     {% endfor %}
                 </tbody>
@@ -607,56 +352,401 @@ DASHBOARD_HTML = """
         
         <footer style="height: 2rem;"></footer>
     </div>
+    <script>
+        // Patch live values in place; reload only when the activity table changed
+        const tradeVersion = {{ trade_version|tojson }};
+        function setText(id, text, className) {
+            const el = document.getElementById(id);
+            if (!el) return;
+            el.textContent = text;
+            if (className !== undefined) el.className = className;
+        }
+        setInterval(async () => {
+            try {
+                const resp = await fetch("{{ url_for('api_dashboard') }}");
+                if (!resp.ok) return;
+                const d = await resp.json();
+                if (d.trade_version !== tradeVersion) { location.reload(); return; }
+                const s = d.status, t = d.trading_stats;
+                setText('bot-status', s.running ? 'RUNNING' : 'STOPPED',
+                        'status-badge ' + (s.running ? 'status-running' : 'status-stopped'));
+                setText('whale-count', s.whale_count);
+                setText('last-update', s.last_update);
+                setText('current-bankroll', '$' + t.current_bankroll_str);
+                setText('initial-bankroll', '$' + t.initial_bankroll_str);
+                setText('pnl-total', t.total_pnl_str, t.total_pnl_class + ' big-number');
+                setText('win-rate', t.win_rate + '%');
+                setText('wins-losses', t.wins + '/' + t.losses);
+                setText('open-positions', t.open_positions);
+                for (const c of d.crypto_prices) {
+                    setText('coin-' + c.symbol + '-price', '$' + c.price_str);
+                    setText('coin-' + c.symbol + '-change', c.change_str + '%', c.change_class);
+                    setText('coin-' + c.symbol + '-signal', c.signal_label);
+                    const signal = document.getElementById('coin-' + c.symbol + '-signal');
+                    if (signal) signal.style.color = c.signal_color;
+                }
+            } catch (e) {
+                // Keep showing the last values; the next poll retries
+            }
+        }, {{ poll_seconds * 1000 }});
+    </script>
 </body>
 </html>
 """
 
+# (profile address, label, all-time profit) for the Whales Tracked card
+_TRACKED_WHALES = (
+    ('0x63ce342161250d705dc0b16df89036c8e5f9ba9a', '0x8dxd (Primary)', '+$558k'),
+    ('0x9d84ce0306f8551e02efef1680475fc0f1dc1344', '0x9d84...9344', '+$2.6M'),
+    ('0xd218e474776403a330142299f7796e8ba32eb5c9', '0xd218...b5c9', '+$958k'),
+    ('0x006cc834cc092684f1b56626e23bedb3835c16ea', '0x006c...16ea', '+$1.48M'),
+    ('0xe74a4446efd66a4de690962938f550d8921a40ee', '0xe74A...40Ee', '+$434k'),
+    ('0x492442eab586f242b53bda933fd5de859c8a3782', '0x4924...3782', '+$1.42M'),
+)
+
+
+def _render_whale_list():
+    """The Whales Tracked list as HTML; built once since it never changes."""
+    items = ''.join(
+        f'                    <div class="whale-item">\n'
+        f'                        <a href="https://polymarket.com/profile/{escape(address)}" target="_blank" class="whale-addr">{escape(label)}</a>\n'
+        f'                        <span class="whale-profit">{escape(profit)}</span>\n'
+        f'                    </div>\n'
+        for address, label, profit in _TRACKED_WHALES
+    )
+    return Markup(f'<div class="whale-list">\n{items}                </div>')
+
+
+_WHALE_HTML_FRAGMENT = _render_whale_list()
+
+# Compiled template code survives restarts; templates never change while running.
+# No directory argument: Jinja then uses a per-user 0700 directory and refuses
+# one owned by anyone else, so no other local user can plant cached bytecode.
+try:
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+except (OSError, RuntimeError):
+    pass
+app.jinja_env.auto_reload = False
+
+# Loaded once at import through a loader (from_string bypasses the bytecode cache)
+_TEMPLATE = DictLoader({'dashboard.html': DASHBOARD_HTML}).load(
+    app.jinja_env, 'dashboard.html', app.jinja_env.make_globals(None)
+)
+
+# Static assets are cached by browsers; the version query busts it on deploy
+STATIC_MAX_AGE_SECONDS = 86400
+try:
+    _CSS_VERSION = int(os.stat(os.path.join(app.static_folder, 'dashboard.css')).st_mtime)
+except OSError:
+    _CSS_VERSION = 0
+
 # ═══════════════════════════════════════════════════════════════════════════════
-# ROUTES
+# DATA SOURCES
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@app.route('/')
-def index():
-    """Main dashboard page."""
-    # Load whale stats if available
-    whale_stats = {}
+WHALE_STATS_FILE = 'whale_stats.json'
+BOT_STATUS_FILE = 'bot_status.txt'
+
+# Process/service checks are reused for this long (the page polls every DASHBOARD_POLL_SECONDS)
+STATUS_CACHE_SECONDS = 10
+_status_cache = {}  # key -> (monotonic ts, value)
+# (mtime_ns, parsed stats); reparsed only when the file changes
+_whale_cache = (None, {})
+
+# Prices are shown to 2 decimals with 15-min momentum; 20s staleness is invisible
+PRICE_REFRESH_SECONDS = 20
+_PRICE_CACHE = {"version": 0, "data": None}  # version bumps only when the rendered prices change
+_PRICE_LOCK = threading.Lock()
+_price_refresher_started = False
+_HTTP = None  # requests.Session, created on first price fetch
+
+# (CoinGecko id, symbol, icon, placeholder price) in display order
+_COIN_MAP = (
+    ('bitcoin', 'BTC', '₿', 97000.0),
+    ('ethereum', 'ETH', 'Ξ', 3300.0),
+    ('solana', 'SOL', '◎', 185.0),
+    ('ripple', 'XRP', '✕', 2.30),
+)
+_COIN_IDS = tuple(coin_id for coin_id, _, _, _ in _COIN_MAP)
+COINGECKO_PRICE_URL = (
+    "https://api.coingecko.com/api/v3/simple/price"
+    f"?ids={','.join(_COIN_IDS)}&vs_currencies=usd&include_24hr_change=true"
+)
+
+# Strategy settings shown on the dashboard (display only)
+_CONFIG = {
+    'bankroll': 1000,
+    'bet_size': 5,
+    'edge_threshold': 10,
+    'max_position': 50
+}
+
+# The page polls /api/dashboard this often instead of reloading itself
+DASHBOARD_POLL_SECONDS = 15
+
+# Runs the independent data-source lookups for a page view concurrently
+_IO_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard-io")
+
+
+def _get_whale_stats():
+    """Whale stats from WHALE_STATS_FILE, re-read only when its mtime changes."""
+    global _whale_cache
+    try:
+        mtime = os.stat(WHALE_STATS_FILE).st_mtime_ns
+    except OSError:
+        return {}
+    
+    cached_mtime, stats = _whale_cache
+    if mtime != cached_mtime:
+        try:
+            with open(WHALE_STATS_FILE, 'rb') as f:
+                raw = f.read()
+            stats = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        except Exception:
+            stats = {}
+        _whale_cache = (mtime, stats)
+    return stats
+
+
+def _cached_status(key, compute):
+    """Return compute() for key, reusing the result for STATUS_CACHE_SECONDS."""
+    now = time.monotonic()
+    entry = _status_cache.get(key)
+    if entry is None or now - entry[0] > STATUS_CACHE_SECONDS:
+        entry = (now, compute())
+        _status_cache[key] = entry
+    return entry[1]
+
+
+def _process_running(pattern: str) -> bool:
+    """Like `pgrep -f pattern`, but reads /proc directly instead of forking."""
+    if not os.path.isdir('/proc'):
+        return subprocess.run(['pgrep', '-f', pattern], capture_output=True).returncode == 0
+    
+    needle = pattern.encode()
+    own_pid = str(os.getpid())
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit() or pid == own_pid:
+            continue
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                if needle in f.read():
+                    return True
+        except OSError:
+            continue  # Process exited or is not readable
+    return False
+
+
+def _check_bot_running() -> bool:
+    """Bot status file if the bot writes one, otherwise look for the process."""
+    try:
+        if os.path.exists(BOT_STATUS_FILE):
+            with open(BOT_STATUS_FILE, 'r') as f:
+                return f.read().strip() == 'running'
+        return _process_running('new_trader')
+    except Exception:
+        return True  # Assume running if check fails
+
+
+def _check_service_active() -> bool:
+    """Whether the polymarket-bot systemd unit is active."""
     try:
-        if os.path.exists('whale_stats.json'):
-            with open('whale_stats.json', 'r') as f:
-                whale_stats = json.load(f)
-    except:
-        pass
+        result = subprocess.run(['systemctl', 'is-active', 'polymarket-bot'],
+                                capture_output=True, text=True)
+        return result.stdout.strip() == 'active'
+    except Exception:
+        return False
+
+
+def _is_running() -> bool:
+    """Cached bot running check for the dashboard page."""
+    return _cached_status('bot', _check_bot_running)
+
+
+def _is_service_active() -> bool:
+    """Cached systemd check for /api/status."""
+    return _cached_status('service', _check_service_active)
+
+
+def _default_crypto_prices():
+    """Placeholder prices shown until CoinGecko answers."""
+    return [
+        {'symbol': symbol, 'icon': icon, 'price': price, 'change': 0.0, 'momentum': 0.0}
+        for _, symbol, icon, price in _COIN_MAP
+    ]
+
+
+def _format_coin(coin):
+    """Add the display strings the price cards render."""
+    price, change, momentum = coin['price'], coin['change'], coin['momentum']
+    coin['price_str'] = f"{price:.2f}" if price < 1000 else f"{price:.0f}"
+    coin['change_sign'] = '+' if change >= 0 else ''
+    coin['change_str'] = f"{coin['change_sign']}{change:.2f}"
+    coin['change_class'] = 'pnl-positive' if change >= 0 else 'pnl-negative'
+    coin['signal_color'] = (
+        'var(--success)' if momentum > 0 else 'var(--danger)' if momentum < 0 else 'var(--text-secondary)'
+    )
+    coin['signal_label'] = (
+        "↑ BULLISH" if momentum > 0.5 else "↓ BEARISH" if momentum < -0.5 else "→ NEUTRAL"
+    )
+    return coin
+
+
+def _format_stats(stats):
+    """Add the display strings the bankroll card renders."""
+    total_pnl = stats['total_pnl']
+    stats['current_bankroll_str'] = f"{stats['current_bankroll']:.2f}"
+    stats['initial_bankroll_str'] = f"{stats['initial_bankroll']:.2f}"
+    stats['total_pnl_str'] = f"{'+' if total_pnl >= 0 else ''}${total_pnl:.2f}"
+    stats['total_pnl_class'] = 'pnl-positive' if total_pnl >= 0 else 'pnl-negative'
+    return stats
+
+
+# Recent Activity status cell: status -> (CSS class, label)
+_STATUS_DISPLAY = {
+    'OPEN': ('text-accent', 'OPEN'),
+    'WON': ('pnl-positive', 'WON'),
+    'LOST': ('pnl-negative', 'LOST'),
+}
+_SKIP_STATUS_DISPLAY = ('pnl-neutral', '-')
+
+
+def _format_trade(trade):
+    """Add the display strings the Recent Activity table renders."""
+    timestamp, size, edge, pnl = trade.get('timestamp'), trade.get('size'), trade.get('edge'), trade.get('pnl')
+    trade['ts_short'] = timestamp[:16] if timestamp else '-'
+    trade['size_str'] = f"${size:.2f}" if size else '-'
+    trade['edge_str'] = f"{edge:.1f}%" if edge else '-'
+    if trade.get('type') == 'SKIP':
+        trade['market_label'] = trade.get('market_question') or trade.get('reason') or '-'
+        trade['side_class'], trade['side_label'] = 'text-warning', 'SKIP'
+        trade['status_class'], trade['status_label'] = _SKIP_STATUS_DISPLAY
+    else:
+        direction, status = trade.get('direction'), trade.get('status')
+        trade['market_label'] = trade.get('market_question') or '-'
+        trade['side_class'] = 'pnl-positive' if direction == 'YES' else 'pnl-negative'
+        trade['side_label'] = direction
+        trade['status_class'], trade['status_label'] = _STATUS_DISPLAY.get(status, ('', status))
+    if pnl is not None:
+        trade['pnl_str'] = f"{'+' if pnl >= 0 else ''}${pnl:.2f}"
+        trade['pnl_class'] = 'pnl-positive' if pnl >= 0 else 'pnl-negative'
+    else:
+        trade['pnl_str'], trade['pnl_class'] = '-', ''
+    return trade
+
+
+def _get_http_session():
+    """Keep-alive session for CoinGecko so refreshes reuse one TLS connection."""
+    global _HTTP
+    if _HTTP is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=2))
+        _HTTP = session
+    return _HTTP
+
+
+def _fetch_crypto_prices():
+    """Fetch crypto prices from CoinGecko; None if the request failed."""
+    crypto_prices = _default_crypto_prices()
     
-    # Check if bot is running by looking for the process or a status file
-    running = True  # Default to showing running - we started it
     try:
-        # Check if status file exists (bot updates this)
-        if os.path.exists('bot_status.txt'):
-            with open('bot_status.txt', 'r') as f:
-                running = f.read().strip() == 'running'
-        else:
-            # Check via process list for new_trader
-            import subprocess
-            result = subprocess.run(['pgrep', '-f', 'new_trader'], capture_output=True)
-            running = result.returncode == 0
-    except:
-        running = True  # Assume running if check fails
+        resp = _get_http_session().get(COINGECKO_PRICE_URL, timeout=5)
+        if resp.status_code != 200:
+            return None
+        data = orjson.loads(resp.content) if ORJSON_AVAILABLE else resp.json()
+        for coin_id, coin in zip(_COIN_IDS, crypto_prices):
+            quote = data.get(coin_id)
+            if not quote:
+                continue
+            change = quote.get('usd_24h_change', 0) / 96  # Approx 15min from 24h
+            coin.update(
+                price=quote.get('usd', coin['price']),
+                change=change,
+                momentum=1.0 if change > 0.1 else (-1.0 if change < -0.1 else 0.0)
+            )
+    except Exception as e:
+        print(f"Error fetching crypto prices: {e}")
+        return None
     
-    status = {
+    return crypto_prices
+
+
+def _refresh_crypto_prices():
+    """Fetch prices into the cache, keeping the last good prices on failure."""
+    prices = _fetch_crypto_prices()
+    if prices is not None or _PRICE_CACHE["data"] is None:
+        # Format once per refresh rather than once per page view
+        formatted = [_format_coin(coin) for coin in prices or _default_crypto_prices()]
+        if formatted != _PRICE_CACHE["data"]:
+            _PRICE_CACHE["data"] = formatted
+            _PRICE_CACHE["version"] += 1
+
+
+def _price_refresher():
+    """Background loop keeping the price cache warm."""
+    while True:
+        time.sleep(PRICE_REFRESH_SECONDS)
+        _refresh_crypto_prices()
+
+
+def _get_crypto_prices():
+    """Crypto prices for the dashboard; requests never wait on CoinGecko after the first."""
+    global _price_refresher_started
+    if not _price_refresher_started:
+        with _PRICE_LOCK:
+            if not _price_refresher_started:
+                # First request in this process: fetch once, then refresh in the background
+                _refresh_crypto_prices()
+                threading.Thread(target=_price_refresher, name="price-refresher", daemon=True).start()
+                _price_refresher_started = True
+    return _PRICE_CACHE["data"]
+
+
+def _trade_version():
+    """TradeLogger change counter, or None without a trade logger."""
+    if get_trade_logger is None:
+        return None
+    try:
+        return get_trade_logger().version
+    except Exception:
+        return None
+
+
+def _dashboard_etag(running):
+    """Version tag for the dashboard built from the caches it renders from."""
+    key = f'{_PRICE_CACHE["version"]}|{_whale_cache[0]}|{running}|{_trade_version()}|{_CSS_VERSION}'
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def _etag_matches(etag):
+    """True if the request's If-None-Match names this version."""
+    # flask-compress may append ":gzip"/":br" to the tag it sent out
+    return any(tag.split(':', 1)[0] == etag for tag in request.if_none_match.as_set(include_weak=True))
+
+
+def _gather_sources():
+    """Whale stats, bot running flag and crypto prices, fetched concurrently."""
+    # Independent lookups; on a cold cache they overlap instead of adding up
+    f_whales = _IO_POOL.submit(_get_whale_stats)
+    f_running = _IO_POOL.submit(_is_running)
+    f_prices = _IO_POOL.submit(_get_crypto_prices)
+    return f_whales.result(), f_running.result(), f_prices.result()
+
+
+def _build_status(whale_stats, running):
+    """Bot status card values."""
+    return {
         'running': running,
         'mode': 'ACTIVE',
         'last_update': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'whale_count': len(whale_stats) if whale_stats else 6
     }
-    
-    config = {
-        'bankroll': 1000,
-        'bet_size': 5,
-        'edge_threshold': 10,
-        'max_position': 50
-    }
-    
-    # Get trading stats and recent trades
+
+
+def _load_trading():
+    """Formatted trading stats and the 10 most recent activities (newest first)."""
     trading_stats = {
         'initial_bankroll': 1000.0,
         'current_bankroll': 1000.0,
@@ -671,77 +761,96 @@ def index():
     
     try:
         if get_trade_logger is not None:
-            logger = get_trade_logger()
-            trading_stats = logger.get_stats()
-            recent_trades = logger.get_recent_activity(10)
-            # Reverse to show newest first
-            recent_trades = list(reversed(recent_trades))
+            bundle = get_trade_logger().get_dashboard_bundle(10)
+            trading_stats = bundle['stats']
+            recent_trades = [_format_trade(t) for t in bundle['recent_activity']]
     except Exception as e:
         print(f"Error loading trade stats: {e}")
     
-    # Fetch crypto prices from CoinGecko
-    crypto_prices = [
-        {'symbol': 'BTC', 'icon': '₿', 'price': 97000.0, 'change': 0.0, 'momentum': 0.0},
-        {'symbol': 'ETH', 'icon': 'Ξ', 'price': 3300.0, 'change': 0.0, 'momentum': 0.0},
-        {'symbol': 'SOL', 'icon': '◎', 'price': 185.0, 'change': 0.0, 'momentum': 0.0},
-        {'symbol': 'XRP', 'icon': '✕', 'price': 2.30, 'change': 0.0, 'momentum': 0.0},
-    ]
+    return _format_stats(trading_stats), recent_trades
+
+
+def _not_modified(etag):
+    """Empty 304 response carrying the current ETag."""
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ROUTES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@app.route('/')
+def index():
+    """Main dashboard page."""
+    whale_stats, running, crypto_prices = _gather_sources()
     
-    try:
-        import requests
-        # CoinGecko API for price data
-        coins = ['bitcoin', 'ethereum', 'solana', 'ripple']
-        url = f"https://api.coingecko.com/api/v3/simple/price?ids={','.join(coins)}&vs_currencies=usd&include_24hr_change=true"
-        resp = requests.get(url, timeout=5)
-        if resp.status_code == 200:
-            data = resp.json()
-            if 'bitcoin' in data:
-                crypto_prices[0]['price'] = data['bitcoin'].get('usd', 97000)
-                crypto_prices[0]['change'] = data['bitcoin'].get('usd_24h_change', 0) / 96  # Approx 15min from 24h
-                crypto_prices[0]['momentum'] = 1.0 if crypto_prices[0]['change'] > 0.1 else (-1.0 if crypto_prices[0]['change'] < -0.1 else 0.0)
-            if 'ethereum' in data:
-                crypto_prices[1]['price'] = data['ethereum'].get('usd', 3300)
-                crypto_prices[1]['change'] = data['ethereum'].get('usd_24h_change', 0) / 96
-                crypto_prices[1]['momentum'] = 1.0 if crypto_prices[1]['change'] > 0.1 else (-1.0 if crypto_prices[1]['change'] < -0.1 else 0.0)
-            if 'solana' in data:
-                crypto_prices[2]['price'] = data['solana'].get('usd', 185)
-                crypto_prices[2]['change'] = data['solana'].get('usd_24h_change', 0) / 96
-                crypto_prices[2]['momentum'] = 1.0 if crypto_prices[2]['change'] > 0.1 else (-1.0 if crypto_prices[2]['change'] < -0.1 else 0.0)
-            if 'ripple' in data:
-                crypto_prices[3]['price'] = data['ripple'].get('usd', 2.30)
-                crypto_prices[3]['change'] = data['ripple'].get('usd_24h_change', 0) / 96
-                crypto_prices[3]['momentum'] = 1.0 if crypto_prices[3]['change'] > 0.1 else (-1.0 if crypto_prices[3]['change'] < -0.1 else 0.0)
-    except Exception as e:
-        print(f"Error fetching crypto prices: {e}")
+    # Nothing shown has changed since the browser's copy: skip the render entirely
+    etag = _dashboard_etag(running)
+    if _etag_matches(etag):
+        return _not_modified(etag)
     
-    return render_template_string(
-        DASHBOARD_HTML, 
-        status=status, 
-        config=config,
+    status = _build_status(whale_stats, running)
+    
+    # Get trading stats and recent trades
+    trading_stats, recent_trades = _load_trading()
+    
+    # Stream the page so the header and status cards ship before the tables render
+    stream = _TEMPLATE.stream(
+        status=status,
+        config=_CONFIG,
+        whale_html=_WHALE_HTML_FRAGMENT,
         trading_stats=trading_stats,
         recent_trades=recent_trades,
-        crypto_prices=crypto_prices
+        crypto_prices=crypto_prices,
+        css_version=_CSS_VERSION,
+        trade_version=_trade_version(),
+        poll_seconds=DASHBOARD_POLL_SECONDS
     )
+    stream.enable_buffering(size=5)
+    response = Response(stream_with_context(stream), mimetype='text/html')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate; 304 when unchanged
+    return response
+
+
+@app.route('/api/dashboard')
+def api_dashboard():
+    """Live values the dashboard page polls for instead of reloading."""
+    whale_stats, running, crypto_prices = _gather_sources()
+    
+    etag = _dashboard_etag(running)
+    if _etag_matches(etag):
+        return _not_modified(etag)
+    
+    trading_stats, recent_trades = _load_trading()
+    response = jsonify({
+        'status': _build_status(whale_stats, running),
+        'trading_stats': trading_stats,
+        'crypto_prices': crypto_prices,
+        'recent_trades': recent_trades,
+        'trade_version': _trade_version()
+    })
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.after_request
+def add_cache_headers(response):
+    """Let browsers cache static assets instead of refetching every refresh."""
+    if request.path.startswith(app.static_url_path + '/'):
+        response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE_SECONDS}'
+    return response
 
 
 @app.route('/api/status')
 def api_status():
     """API endpoint for bot status."""
-    import subprocess
-    try:
-        result = subprocess.run(['systemctl', 'is-active', 'polymarket-bot'], 
-                               capture_output=True, text=True)
-        running = result.stdout.strip() == 'active'
-    except:
-        running = False
+    running = _is_service_active()
     
-    whale_stats = {}
-    try:
-        if os.path.exists('whale_stats.json'):
-            with open('whale_stats.json', 'r') as f:
-                whale_stats = json.load(f)
-    except:
-        pass
+    whale_stats = _get_whale_stats()
     
     return jsonify({
         'running': running,
@@ -8,13 +8,37 @@ New approach: Fetch recent trades, identify large-volume wallets as "whales".
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
 import time
 import logging
+import re
+import sys
+import threading
+from collections import defaultdict
+from itertools import groupby
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass, field
 import json
 
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 from config import Config, REQUEST_TIMEOUT
 
 logger = logging.getLogger(__name__)
@@ -26,11 +50,30 @@ logger = logging.getLogger(__name__)
 GAMMA_API_BASE = "https://gamma-api.polymarket.com"
 DATA_API_BASE = "https://data-api.polymarket.com"
 
+# Data API /trades page size; extra pages are fetched concurrently
+TRADES_PAGE_SIZE = 500
+PAGE_FETCH_WORKERS = 8
+
+# Wallets per Data API /positions request (keeps the query string bounded)
+POSITIONS_BATCH_SIZE = 50
+
+# Timeout for the startup HEAD probe that pre-opens the Data API connection
+WARMUP_TIMEOUT = 5
+
+# Crypto market filter: one case-insensitive scan per question (substring match)
+_CRYPTO_KEYWORDS_RE = re.compile(r"btc|bitcoin|eth|ethereum|sol|solana|xrp|ripple", re.IGNORECASE)
+
+# Failures while decoding a trades body (orjson/json, ijson, or the raw stream itself)
+_PARSE_ERRORS = (ValueError, Urllib3HTTPError) + ((ijson.JSONError,) if IJSON_AVAILABLE else ())
+
+# Outcomes whose BUY side is a bearish bet
+_BEARISH_OUTCOMES = frozenset({"NO", "DOWN"})
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # DATA CLASSES
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WhaleTrade:
     """A single trade by a whale wallet."""
     wallet: str
@@ -41,21 +84,24 @@ class WhaleTrade:
     size: float           # In contracts
     price: float          # 0-1
     usd_value: float
-    timestamp: datetime
+    timestamp_ts: float   # Unix seconds; the datetime is built on first access
+    sign: int             # +1 bullish (BUY YES / SELL NO), -1 bearish; set at parse time
+    _timestamp: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Trade time as a naive local datetime (constructed lazily, then cached)."""
+        if self._timestamp is None:
+            object.__setattr__(self, "_timestamp", datetime.fromtimestamp(self.timestamp_ts))
+        return self._timestamp
     
     @property
     def direction(self) -> float:
         """Net directional signal: positive = bullish, negative = bearish."""
-        # BUY YES = bullish (+1), SELL YES = bearish (-1)
-        # BUY NO = bearish (-1), SELL NO = bullish (+1)
-        outcome_upper = self.outcome.upper()
-        base = 1.0 if self.side == "BUY" else -1.0
-        if outcome_upper in ["NO", "DOWN"]:
-            base *= -1
-        return base * self.size
+        return self.sign * self.size
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WhalePosition:
     """Current position held by a whale."""
     wallet: str
@@ -70,7 +116,7 @@ class WhalePosition:
     last_updated: datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketSignal:
     """Aggregated signal for a specific market."""
     market_id: str
@@ -84,6 +130,88 @@ class MarketSignal:
     timestamp: datetime
 
 
+@dataclass(slots=True, frozen=True)
+class TradeColumns:
+    """
+    Columnar (struct-of-arrays) copy of collected trades for vectorized aggregation.
+    
+    Rows are sorted by market, then wallet, so each market is one contiguous
+    slice starting at group_starts[code] and per-market sums are a single
+    reduceat; within a market, each wallet's trades are contiguous too.
+    """
+    market_ids: np.ndarray      # Unique market ids; a trade's market_code indexes this
+    market_code: np.ndarray     # int64 per trade, non-decreasing
+    group_starts: np.ndarray    # First row of each market code
+    wallet_ids: np.ndarray      # Unique lowercased wallets; a trade's wallet_code indexes this
+    wallet_code: np.ndarray     # int64 per trade
+    size: np.ndarray            # float64 per trade
+    price: np.ndarray           # float64 per trade
+    usd_value: np.ndarray       # float64 per trade
+    sign: np.ndarray            # int8 per trade (WhaleTrade.sign)
+    direction: np.ndarray       # float64 per trade (sign * size)
+    
+    @classmethod
+    def from_trades(cls, trades: List[WhaleTrade]) -> "TradeColumns":
+        n = len(trades)
+        market_ids, market_code = np.unique(
+            np.array([t.market_id for t in trades], dtype=object), return_inverse=True
+        )
+        market_code = market_code.astype(np.int64).reshape(-1)
+        wallet_ids, wallet_code = np.unique(
+            np.array([t.wallet.lower() for t in trades], dtype=object), return_inverse=True
+        )
+        wallet_code = wallet_code.astype(np.int64).reshape(-1)
+        order = np.lexsort((wallet_code, market_code))
+        market_code = market_code[order]
+        size = np.fromiter((t.size for t in trades), dtype=np.float64, count=n)[order]
+        sign = np.fromiter((t.sign for t in trades), dtype=np.int8, count=n)[order]
+        return cls(
+            market_ids=market_ids,
+            market_code=market_code,
+            group_starts=np.searchsorted(market_code, np.arange(len(market_ids))),
+            wallet_ids=wallet_ids,
+            wallet_code=wallet_code[order],
+            size=size,
+            price=np.fromiter((t.price for t in trades), dtype=np.float64, count=n)[order],
+            usd_value=np.fromiter((t.usd_value for t in trades), dtype=np.float64, count=n)[order],
+            sign=sign,
+            direction=sign * size
+        )
+    
+    def _by_market(self, values: np.ndarray) -> Dict[str, float]:
+        totals = np.add.reduceat(values, self.group_starts) if len(values) else values
+        return dict(zip(self.market_ids.tolist(), totals.tolist()))
+    
+    def market_volumes(self) -> Dict[str, float]:
+        """Total USD traded per market."""
+        return self._by_market(self.usd_value)
+    
+    def market_wallet_totals(self):
+        """
+        Per (market, wallet) sums of direction and USD value.
+        
+        Returns:
+            (pair_starts, pair_wallet_code, pair_direction, pair_usd_value) where
+            pairs are ordered by market and pair_starts[code] is each market's first pair
+        """
+        n = len(self.size)
+        if n == 0:
+            empty = np.zeros(0)
+            return np.zeros(len(self.market_ids), dtype=np.int64), np.zeros(0, dtype=np.int64), empty, empty
+        new_pair = np.ones(n, dtype=bool)
+        new_pair[1:] = (
+            (self.market_code[1:] != self.market_code[:-1]) |
+            (self.wallet_code[1:] != self.wallet_code[:-1])
+        )
+        rows = np.flatnonzero(new_pair)
+        return (
+            np.searchsorted(self.market_code[rows], np.arange(len(self.market_ids))),
+            self.wallet_code[rows],
+            np.add.reduceat(self.direction, rows),
+            np.add.reduceat(self.usd_value, rows)
+        )
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # WHALE DATA COLLECTOR
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -98,13 +226,43 @@ class WhaleDataCollector:
     - Identify whale wallets by trade volume
     """
     
-    def __init__(self, whale_addresses: List[str] = None):
+    def __init__(self, whale_addresses: List[str] = None, warm_connection: bool = True):
         # Keep for backwards compat, but now used as high-priority wallets
         self.whale_addresses = whale_addresses or Config.whale.known_whales
         self.trades_cache: Dict[str, List[WhaleTrade]] = {}
         self.positions_cache: Dict[str, List[WhalePosition]] = {}
         self.last_fetch: Optional[datetime] = None
         
+        # Built once per collection so market lookups don't rescan every wallet
+        self._all_trades: List[WhaleTrade] = []
+        self._by_market: Dict[str, List[WhaleTrade]] = {}
+        self._trade_columns: Optional[TradeColumns] = None  # Built on first use per collection
+        
+        # Conditional-fetch state per (limit, offset) page: validators from the
+        # last 200 response and the parsed trades to reuse on 304 Not Modified
+        self._etag_by_page: Dict[tuple, str] = {}
+        self._last_modified_by_page: Dict[tuple, str] = {}
+        self._trades_by_page: Dict[tuple, List[WhaleTrade]] = {}
+        
+        # TTL cache over collect_all_whale_data
+        self.cache_ttl_seconds = Config.whale.cache_ttl_seconds
+        self._last_result: Optional[Dict[str, Any]] = None
+        self._last_result_pages = 0
+        self._last_result_ts = float('-inf')
+        
+        # One keep-alive session so every poll reuses the warm TLS connection
+        self._session = requests.Session()
+        self._session.headers.update(Config.headers)
+        self._session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504])
+        ))
+        if warm_connection:
+            # Pay the TCP/TLS handshake in the background while the bot starts up
+            threading.Thread(target=self._warm_connection, name="whale-warmup", daemon=True).start()
+        
         # Whale weights (for priority ordering)
         self.whale_weights = {
             "0x63ce342161250d705dc0b16df89036c8e5f9ba9a": 1.5,  # 0x8dxd
@@ -119,57 +277,146 @@ class WhaleDataCollector:
     # DATA API - Primary Source
     # ─────────────────────────────────────────────────────────────────────────
     
-    def fetch_recent_trades(self, limit: int = 500) -> List[WhaleTrade]:
+    def fetch_recent_trades(
+        self,
+        limit: int = TRADES_PAGE_SIZE,
+        offset: int = 0,
+        crypto_only: bool = False
+    ) -> List[WhaleTrade]:
         """
         Fetch recent trades from Data API.
         Returns trades across all markets with wallet info.
+        
+        With crypto_only, rows are filtered on their raw title before any
+        WhaleTrade is built (same rule as filter_crypto_trades). If ijson is
+        installed the body is also parsed incrementally, so only one row is
+        held at a time instead of the whole page.
         """
         url = f"{DATA_API_BASE}/trades"
         params = {"limit": limit}
+        if offset:
+            params["offset"] = offset
         
+        page_key = (limit, offset, crypto_only)
+        headers = {}
+        if page_key in self._trades_by_page:
+            if page_key in self._etag_by_page:
+                headers["If-None-Match"] = self._etag_by_page[page_key]
+            if page_key in self._last_modified_by_page:
+                headers["If-Modified-Since"] = self._last_modified_by_page[page_key]
+        
+        stream = IJSON_AVAILABLE and crypto_only
+        response = None
         try:
-            response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+            response = self._session.get(
+                url, params=params, headers=headers, timeout=REQUEST_TIMEOUT, stream=stream
+            )
+            
+            # Page unchanged since last poll - skip the decode and parse entirely
+            if response.status_code == 304 and page_key in self._trades_by_page:
+                logger.info("[DataAPI] Trades unchanged (304)")
+                return list(self._trades_by_page[page_key])
+            
             response.raise_for_status()
-            data = response.json()
+            if stream:
+                response.raw.decode_content = True  # Let urllib3 undo the gzip encoding
+                data = ijson.items(response.raw, "item", use_float=True)
+            else:
+                data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
             
+            search = _CRYPTO_KEYWORDS_RE.search
             trades = []
+            total = 0
             for item in data:
+                total += 1
                 try:
-                    # Parse Unix timestamp
+                    title = item.get("title", "Unknown")
+                    if crypto_only and not search(title):
+                        continue
+                    
+                    # Unix timestamp, kept raw; WhaleTrade.timestamp converts on demand
                     ts = item.get("timestamp", 0)
-                    if isinstance(ts, (int, float)):
-                        timestamp = datetime.fromtimestamp(ts)
-                    else:
-                        timestamp = datetime.utcnow()
+                    if not isinstance(ts, (int, float)):
+                        ts = datetime.utcnow().timestamp()
                     
-                    side = item.get("side", "BUY").upper()
-                    outcome = item.get("outcome", "YES")
+                    # Interned: a page repeats the same few ids/sides/outcomes many times over
+                    market_id = sys.intern(item.get("conditionId") or item.get("asset") or "")
+                    side = sys.intern(item.get("side", "BUY").upper())
+                    outcome = sys.intern(item.get("outcome", "YES"))
+                    # BUY YES / SELL NO = bullish (+1), SELL YES / BUY NO = bearish (-1)
+                    sign = (1 if side == "BUY" else -1) * (-1 if outcome.upper() in _BEARISH_OUTCOMES else 1)
                     size = float(item.get("size", 0) or 0)
                     price = float(item.get("price", 0) or 0)
                     wallet = item.get("proxyWallet", "").lower()
                     
                     trade = WhaleTrade(
                         wallet=wallet,
-                        market_id=item.get("conditionId", item.get("asset", "")),
-                        market_question=item.get("title", "Unknown"),
+                        market_id=market_id,
+                        market_question=title,
                         outcome=outcome,
                         side=side,
                         size=size,
                         price=price,
                         usd_value=size * price,
-                        timestamp=timestamp
+                        timestamp_ts=ts,
+                        sign=sign
                     )
                     trades.append(trade)
                 except Exception as e:
                     logger.debug(f"Error parsing trade: {e}")
                     continue
             
-            logger.info(f"[DataAPI] Fetched {len(trades)} recent trades")
-            return trades
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._trades_by_page[page_key] = trades
+                if etag:
+                    self._etag_by_page[page_key] = etag
+                if last_modified:
+                    self._last_modified_by_page[page_key] = last_modified
             
-        except requests.exceptions.RequestException as e:
+            if crypto_only:
+                logger.info(f"[DataAPI] Fetched {len(trades)} crypto trades of {total} total")
+            else:
+                logger.info(f"[DataAPI] Fetched {len(trades)} recent trades")
+            return list(trades)
+            
+        except (requests.exceptions.RequestException, *_PARSE_ERRORS) as e:
+            # Malformed or truncated bodies surface from the parser, not as RequestException
             logger.warning(f"[DataAPI] Failed: {e}")
             return []
+        finally:
+            if response is not None:
+                response.close()
+    
+    def fetch_trade_pages(
+        self,
+        pages: int,
+        page_size: int = TRADES_PAGE_SIZE,
+        crypto_only: bool = False
+    ) -> List[WhaleTrade]:
+        """Fetch several pages of recent trades on a thread pool, newest page first."""
+        if pages <= 1:
+            return self.fetch_recent_trades(limit=page_size, crypto_only=crypto_only)
+        
+        # The Session's connection pool is shared (pool_maxsize >= PAGE_FETCH_WORKERS)
+        with ThreadPoolExecutor(max_workers=min(pages, PAGE_FETCH_WORKERS)) as executor:
+            results = executor.map(
+                lambda offset: self.fetch_recent_trades(limit=page_size, offset=offset, crypto_only=crypto_only),
+                range(0, pages * page_size, page_size)
+            )
+            return [trade for page_trades in results for trade in page_trades]
+    
+    def _warm_connection(self):
+        """HEAD the trades endpoint once so the pool holds an open connection."""
+        try:
+            self._session.head(f"{DATA_API_BASE}/trades", timeout=WARMUP_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"[DataAPI] Connection warm-up failed: {e}")
+    
+    def close(self):
+        """Release the pooled HTTP connections."""
+        self._session.close()
     
     # ─────────────────────────────────────────────────────────────────────────
     # CRYPTO MARKET FILTERING
@@ -177,13 +424,8 @@ class WhaleDataCollector:
     
     def filter_crypto_trades(self, trades: List[WhaleTrade]) -> List[WhaleTrade]:
         """Filter for crypto market trades (BTC/ETH/SOL/XRP)."""
-        crypto_keywords = ['btc', 'bitcoin', 'eth', 'ethereum', 'sol', 'solana', 'xrp', 'ripple']
-        crypto_trades = []
-        
-        for trade in trades:
-            question_lower = trade.market_question.lower()
-            if any(kw in question_lower for kw in crypto_keywords):
-                crypto_trades.append(trade)
+        search = _CRYPTO_KEYWORDS_RE.search
+        crypto_trades = [trade for trade in trades if search(trade.market_question)]
         
         logger.info(f"[Filter] {len(crypto_trades)} crypto trades of {len(trades)} total")
         return crypto_trades
@@ -197,14 +439,12 @@ class WhaleDataCollector:
         Identify wallets with significant trading volume.
         Groups trades by wallet, filters for big players.
         """
-        wallet_trades: Dict[str, List[WhaleTrade]] = {}
-        wallet_volume: Dict[str, float] = {}
+        wallet_trades: Dict[str, List[WhaleTrade]] = defaultdict(list)
+        wallet_volume: Dict[str, float] = defaultdict(float)
         
+        # Single pass: group and total each wallet's volume
         for trade in trades:
             wallet = trade.wallet
-            if wallet not in wallet_trades:
-                wallet_trades[wallet] = []
-                wallet_volume[wallet] = 0
             wallet_trades[wallet].append(trade)
             wallet_volume[wallet] += trade.usd_value
         
@@ -222,29 +462,37 @@ class WhaleDataCollector:
     # MAIN COLLECTION METHOD
     # ─────────────────────────────────────────────────────────────────────────
     
-    def collect_all_whale_data(self, lookback_hours: int = 24) -> Dict[str, Any]:
+    def collect_all_whale_data(
+        self,
+        lookback_hours: int = 24,
+        pages: int = 1,
+        force: bool = False
+    ) -> Dict[str, Any]:
         """
         Collect recent crypto market trades and identify whale activity.
-        """
-        logger.info("Collecting crypto market trades...")
         
-        # Fetch all recent trades
-        all_trades = self.fetch_recent_trades(limit=500)
+        Args:
+            lookback_hours: Kept for API compatibility
+            pages: Data API pages of TRADES_PAGE_SIZE trades, fetched in parallel
+            force: Refetch even if the last collection is younger than cache_ttl_seconds
+        """
+        # Burst callers within the TTL share the last successful collection
+        if (
+            not force and
+            self._last_result is not None and
+            self._last_result_pages == pages and
+            time.monotonic() - self._last_result_ts < self.cache_ttl_seconds
+        ):
+            return {**self._last_result, "trades": list(self._all_trades)}
         
-        if not all_trades:
-            logger.warning("No trades fetched from API")
-            return {
-                "trades": [], 
-                "positions": [], 
-                "whale_count": 0, 
-                "timestamp": datetime.utcnow().isoformat()
-            }
+        logger.info("Collecting crypto market trades...")
         
-        # Filter for crypto markets
-        crypto_trades = self.filter_crypto_trades(all_trades)
+        # Fetch recent crypto-market trades (extra pages in parallel); non-crypto
+        # rows are dropped during parsing instead of after building every trade
+        crypto_trades = self.fetch_trade_pages(pages, crypto_only=True)
         
         if not crypto_trades:
-            logger.warning("No crypto trades found")
+            logger.warning("No crypto trades fetched from API")
             return {
                 "trades": [], 
                 "positions": [], 
@@ -262,20 +510,37 @@ class WhaleDataCollector:
         all_whale_trades = []
         for wallet_trades in whale_groups.values():
             all_whale_trades.extend(wallet_trades)
+        self._index_trades(all_whale_trades)
         
         logger.info(f"Total: {len(all_whale_trades)} trades from {len(whale_groups)} wallets")
         
-        return {
+        self._last_result = {
             "trades": all_whale_trades,
             "positions": [],
             "whale_count": len(whale_groups),
             "timestamp": self.last_fetch.isoformat()
         }
+        self._last_result_pages = pages
+        self._last_result_ts = time.monotonic()
+        return {**self._last_result, "trades": list(all_whale_trades)}
     
     # ─────────────────────────────────────────────────────────────────────────
     # ACCESSOR METHODS
     # ─────────────────────────────────────────────────────────────────────────
     
+    def _index_trades(self, trades: List[WhaleTrade]):
+        """
+        Rebuild the flat trade list and the market_id index.
+        Markets come out in sorted id order, matching TradeColumns' market codes.
+        """
+        by_market_id = attrgetter("market_id")
+        self._all_trades = trades
+        self._trade_columns = None
+        self._by_market = {
+            market_id: list(group)
+            for market_id, group in groupby(sorted(trades, key=by_market_id), key=by_market_id)
+        }
+    
     def fetch_whale_trades(
         self, 
         wallet: str, 
@@ -293,33 +558,88 @@ class WhaleDataCollector:
     
     def get_market_activity(self, market_id: str = None) -> List[WhaleTrade]:
         """Get all trades for a specific market or all markets."""
-        trades = []
-        for wallet_trades in self.trades_cache.values():
-            for t in wallet_trades:
-                if market_id is None or t.market_id == market_id:
-                    trades.append(t)
-        return trades
+        if market_id is None:
+            return list(self._all_trades)
+        return list(self._by_market.get(market_id, ()))
+    
+    @property
+    def trade_columns(self) -> TradeColumns:
+        """Columnar copy of the last collection's trades, built on first access."""
+        columns = self._trade_columns
+        if columns is None:
+            columns = self._trade_columns = TradeColumns.from_trades(self._all_trades)
+        return columns
+    
+    def get_market_volumes(self) -> Dict[str, float]:
+        """Total whale USD volume per market, summed over the columnar copy."""
+        return self.trade_columns.market_volumes()
     
     def get_active_markets(self) -> Dict[str, List[WhaleTrade]]:
-        """Group all trades by market."""
-        markets: Dict[str, List[WhaleTrade]] = {}
+        """Group all trades by market (keys in sorted market id order)."""
+        return dict(self._by_market)
+    
+    # ─────────────────────────────────────────────────────────────────────────
+    # POSITIONS
+    # ─────────────────────────────────────────────────────────────────────────
+    
+    def fetch_whale_positions_batch(self, wallets: List[str]) -> Dict[str, List[WhalePosition]]:
+        """
+        Fetch current positions for many wallets at once.
+        One Data API request per POSITIONS_BATCH_SIZE wallets instead of one per
+        wallet; the response is grouped by wallet in-process.
+        """
+        wallets = list(dict.fromkeys(w.lower() for w in wallets if w))
+        positions: Dict[str, List[WhalePosition]] = {w: [] for w in wallets}
+        url = f"{DATA_API_BASE}/positions"
+        now = datetime.utcnow()
         
-        for wallet_trades in self.trades_cache.values():
-            for trade in wallet_trades:
-                if trade.market_id not in markets:
-                    markets[trade.market_id] = []
-                markets[trade.market_id].append(trade)
+        for i in range(0, len(wallets), POSITIONS_BATCH_SIZE):
+            batch = wallets[i:i + POSITIONS_BATCH_SIZE]
+            try:
+                response = self._session.get(
+                    url, params={"users": ",".join(batch)}, timeout=REQUEST_TIMEOUT
+                )
+                response.raise_for_status()
+                data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning(f"[DataAPI] Positions failed for {len(batch)} wallets: {e}")
+                continue
+            
+            for item in data:
+                try:
+                    wallet = item.get("proxyWallet", "").lower()
+                    if wallet not in positions:
+                        continue
+                    positions[wallet].append(WhalePosition(
+                        wallet=wallet,
+                        market_id=sys.intern(item.get("conditionId") or item.get("asset") or ""),
+                        market_question=item.get("title", "Unknown"),
+                        outcome=sys.intern(item.get("outcome", "YES")),
+                        size=float(item.get("size", 0) or 0),
+                        avg_price=float(item.get("avgPrice", 0) or 0),
+                        current_price=float(item.get("curPrice", 0) or 0),
+                        unrealized_pnl=float(item.get("cashPnl", 0) or 0),
+                        realized_pnl=float(item.get("realizedPnl", 0) or 0),
+                        last_updated=now
+                    ))
+                except Exception as e:
+                    logger.debug(f"Error parsing position: {e}")
+                    continue
         
-        return markets
+        logger.info(
+            f"[DataAPI] Fetched {sum(map(len, positions.values()))} positions "
+            f"for {len(wallets)} wallets"
+        )
+        return positions
+    
+    def fetch_whale_positions_gamma(self, wallet: str) -> List[WhalePosition]:
+        """Single-wallet wrapper around fetch_whale_positions_batch."""
+        return self.fetch_whale_positions_batch([wallet]).get(wallet.lower(), [])
     
     # ─────────────────────────────────────────────────────────────────────────
     # DEPRECATED - For backwards compatibility
     # ─────────────────────────────────────────────────────────────────────────
     
-    def fetch_whale_positions_gamma(self, wallet: str) -> List[WhalePosition]:
-        """Deprecated - returns empty list."""
-        return []
-    
     def fetch_whale_positions_subgraph(self, wallet: str) -> List[WhalePosition]:
         """Deprecated - returns empty list."""
         return []
@@ -354,6 +674,7 @@ if __name__ == "__main__":
     markets = collector.get_active_markets()
     print(f"\nActive markets: {len(markets)}")
     
+    volumes = collector.get_market_volumes()
     for market_id, trades in list(markets.items())[:3]:
         print(f"\n  Market: {trades[0].market_question[:40]}...")
-        print(f"  Trades: {len(trades)} | Total: ${sum(t.usd_value for t in trades):.2f}")
+        print(f"  Trades: {len(trades)} | Total: ${volumes[market_id]:.2f}")
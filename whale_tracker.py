@@ -5,18 +5,75 @@ Tracks whale wallets and their positions via Polymarket subgraph.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import threading
 import time
 import json
+import functools
+import io
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterator, Optional, Tuple, Any
 from dataclasses import dataclass, field
 
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from config import (
     SUBGRAPH_URL,
     GAMMA_API_BASE,
     Config,
     REQUEST_TIMEOUT
 )
+from _fusion_jit import NUMBA_AVAILABLE, njit
+
+# Concurrent wallet refresh: worker threads and pooled connections
+REFRESH_WORKERS = 8
+SUBGRAPH_POOL_SIZE = 16
+
+# Wait this long after a 429 that carries no usable Retry-After
+DEFAULT_RETRY_AFTER = 1.0
+
+# Identical subgraph queries within this window are answered from memory. Kept
+# well under any refresh interval (main.py refreshes whales every 60s) so it
+# only merges duplicate/in-flight calls and never replays a previous cycle.
+SUBGRAPH_CACHE_TTL = 5
+SUBGRAPH_CACHE_SIZE = 512
+
+# Deepest the subgraph lets `skip` page into top traders during discovery
+TOP_TRADERS_MAX_ROWS = 5000
+
+# Contracts that show up as position holders but aren't trader wallets
+# (null address, CTF Exchange, Neg Risk CTF Exchange, Neg Risk Adapter)
+_NON_WALLET_ADDRESSES = frozenset({
+    "0x0000000000000000000000000000000000000000",
+    "0x4bfb41d5b3570defd03c39a9a4d8de6bd8b8982e",
+    "0xc5d563a36ae78145c45a50134d48a1215220f80a",
+    "0xd91e80cf2e7be2e162c6513ced06f1dd0da35296",
+})
+
+# Wallets per batched userPositions query, and the subgraph's page size cap
+# (positions are paged with an id cursor, so there is no skip depth limit)
+POSITIONS_BATCH_SIZE = 50
+SUBGRAPH_PAGE_SIZE = 1000
+
+
+def _norm_addr(address: str) -> str:
+    """Canonical wallet key: lowercased and interned, so dict lookups hit by identity."""
+    return sys.intern(address.lower())
+
+
+# Refresh summary table layout
+_SUMMARY_ROW = "{:<20} {:<15} {:<15} {:<15} {:<15}"
+_SUMMARY_HEADER = _SUMMARY_ROW.format("Address", "Alias", "Realized", "Unrealized", "Total PnL")
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # DATA CLASSES
@@ -33,12 +90,62 @@ class WalletPosition:
     current_price: float
     unrealized_pnl: float
     realized_pnl: float
+    pnl_percent: Optional[float] = None  # Derived from the prices when not supplied
+    
+    def __post_init__(self):
+        if self.pnl_percent is None:
+            if self.avg_price == 0:
+                self.pnl_percent = 0
+            else:
+                self.pnl_percent = ((self.current_price - self.avg_price) / self.avg_price) * 100
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class PositionBook:
+    """
+    Struct-of-arrays store for one or more wallets' positions.
+    
+    Numeric columns are float64, labels are object arrays; row i across all
+    columns is one position. Iterating yields WalletPosition objects.
+    Equality compares whole columns (the generated __eq__ would compare
+    ndarrays element-wise, which has no truth value).
+    """
+    market_ids: np.ndarray
+    questions: np.ndarray
+    outcomes: np.ndarray
+    sizes: np.ndarray
+    avg_prices: np.ndarray
+    current_prices: np.ndarray
+    unrealized: np.ndarray
+    realized: np.ndarray
+    pnl_percent: np.ndarray
+    
+    @classmethod
+    def empty(cls) -> "PositionBook":
+        labels = np.empty(0, dtype=object)
+        numbers = np.empty(0, dtype=np.float64)
+        return cls(labels, labels, labels, numbers, numbers, numbers, numbers, numbers, numbers)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PositionBook):
+            return NotImplemented
+        return all(
+            np.array_equal(getattr(self, name), getattr(other, name))
+            for name in self.__slots__
+        )
+    
+    __hash__ = None
+    
+    def __len__(self) -> int:
+        return len(self.sizes)
     
-    @property
-    def pnl_percent(self) -> float:
-        if self.avg_price == 0:
-            return 0
-        return ((self.current_price - self.avg_price) / self.avg_price) * 100
+    def __iter__(self):
+        for row in zip(
+            self.market_ids.tolist(), self.questions.tolist(), self.outcomes.tolist(),
+            self.sizes.tolist(), self.avg_prices.tolist(), self.current_prices.tolist(),
+            self.unrealized.tolist(), self.realized.tolist(), self.pnl_percent.tolist()
+        ):
+            yield WalletPosition(*row)
 
 
 @dataclass
@@ -46,17 +153,19 @@ class WhaleWallet:
     """Represents a whale wallet we're tracking."""
     address: str
     alias: Optional[str] = None
-    total_realized_pnl: float = 0
-    total_unrealized_pnl: float = 0
-    positions: List[WalletPosition] = field(default_factory=list)
+    total_realized_pnl: float = 0   # Sums of positions.realized / .unrealized
+    total_unrealized_pnl: float = 0  # and their total, all computed once per refresh
+    total_pnl: float = 0
+    positions: PositionBook = field(default_factory=PositionBook.empty)
     last_updated: Optional[datetime] = None
     
-    @property
-    def total_pnl(self) -> float:
-        return self.total_realized_pnl + self.total_unrealized_pnl
+    # Staleness check for single-wallet refreshes: latest trade timestamp and the
+    # raw position values the current book was built from
+    last_trade_ts: Optional[str] = field(default=None, repr=False, compare=False)
+    position_values: tuple = field(default=(), repr=False, compare=False)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WhaleActivity:
     """A significant activity by a whale wallet."""
     wallet_address: str
@@ -66,68 +175,350 @@ class WhaleActivity:
     size_usd: float
     price: float
     timestamp: datetime
+    _str: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def __str__(self) -> str:
-        return (
-            f"🐳 {self.activity_type} | {self.wallet_address[:10]}... | "
-            f"${self.size_usd:,.0f} | {self.outcome} @ ${self.price:.3f} | "
-            f"{self.market_question[:40]}..."
-        )
+        """One-line display form (formatted on first use, then cached)."""
+        if self._str is None:
+            object.__setattr__(self, "_str", (
+                f"🐳 {self.activity_type} | {self.wallet_address[:10]}... | "
+                f"${self.size_usd:,.0f} | {self.outcome} @ ${self.price:.3f} | "
+                f"{self.market_question[:40]}..."
+            ))
+        return self._str
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# POSITION KERNELS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@njit(cache=True)
+def _position_pnl_jit(size, avg_price, value, realized):
+    """
+    PnL arithmetic over one wallet's positions (struct-of-arrays).
+    
+    Returns:
+        (current_price, unrealized, total_realized, total_unrealized)
+    """
+    n = size.shape[0]
+    current_price = np.zeros(n)
+    unrealized = np.empty(n)
+    total_realized = 0.0
+    total_unrealized = 0.0
+    for i in range(n):
+        # Unrealized PnL (simplified): current value less cost basis
+        unrealized[i] = value[i] - size[i] * avg_price[i]
+        if size[i] > 0:
+            current_price[i] = value[i] / size[i]
+        total_realized += realized[i]
+        total_unrealized += unrealized[i]
+    return current_price, unrealized, total_realized, total_unrealized
+
+
+def _position_pnl_numpy(size, avg_price, value, realized):
+    """NumPy equivalent of _position_pnl_jit for installs without Numba."""
+    unrealized = value - size * avg_price
+    current_price = np.divide(value, size, out=np.zeros_like(value), where=size > 0)
+    return current_price, unrealized, float(realized.sum()), float(unrealized.sum())
+
+
+position_pnl = _position_pnl_jit if NUMBA_AVAILABLE else _position_pnl_numpy
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# QUERY TEXT
+# ═══════════════════════════════════════════════════════════════════════════════
+# Static per query; only the variables change between calls. Selections are
+# limited to the fields the parsers below actually read.
+
+TOP_TRADERS_QUERY = sys.intern("""
+query TopTraders($limit: Int!, $skip: Int = 0) {
+    userPositions(
+        first: $limit
+        skip: $skip
+        orderBy: realizedPnl
+        orderDirection: desc
+        where: { realizedPnl_gt: "0" }
+    ) {
+        user
+        realizedPnl
+    }
+}
+""")
+
+WALLET_POSITIONS_QUERY = sys.intern("""
+query WalletPositions($wallet: String!, $first: Int!, $cursor: String!) {
+    userPositions(
+        where: { user: $wallet, id_gt: $cursor }
+        first: $first
+        orderBy: id
+        orderDirection: asc
+    ) {
+        id
+        market {
+            id
+            question
+        }
+        outcome
+        size
+        averagePrice
+        realizedPnl
+        value
+    }
+    lastTrade: trades(
+        first: 1
+        orderBy: timestamp
+        orderDirection: desc
+        where: { maker: $wallet }
+    ) {
+        timestamp
+    }
+}
+""")
+
+WALLET_POSITIONS_BATCH_QUERY = sys.intern("""
+query WalletPositionsBatch($wallets: [String!]!, $first: Int!, $cursor: String!) {
+    userPositions(
+        where: { user_in: $wallets, id_gt: $cursor }
+        first: $first
+        orderBy: id
+        orderDirection: asc
+    ) {
+        id
+        user
+        market {
+            id
+            question
+        }
+        outcome
+        size
+        averagePrice
+        realizedPnl
+        value
+    }
+}
+""")
+
+RECENT_TRADES_QUERY = sys.intern("""
+query RecentTrades($wallet: String!, $limit: Int!) {
+    trades(
+        where: { maker: $wallet }
+        first: $limit
+        orderBy: timestamp
+        orderDirection: desc
+    ) {
+        market {
+            id
+            question
+        }
+        outcome
+        side
+        price
+        size
+        timestamp
+    }
+}
+""")
+
+
+def _encode_json(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """JSON bytes (orjson when installed); compact unless indent is set (2 spaces)."""
+    if ORJSON_AVAILABLE:
+        option = (orjson.OPT_SORT_KEYS if sort_keys else 0) | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, sort_keys=sort_keys, indent=2).encode()
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":")).encode()
+
+
+@functools.lru_cache(maxsize=64)
+def _query_body_prefix(query: str) -> bytes:
+    """Pre-encoded `{"query": ..., "variables":` head of a POST body."""
+    return b'{"query":' + _encode_json(query) + b',"variables":'
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# RATE LIMITING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every subgraph caller.
+    
+    Refills at `rps` tokens per second up to `burst`. acquire() takes a token,
+    sleeping until one is available; penalize() holds all callers back for a
+    server-requested cool-down (Retry-After).
+    """
+    
+    def __init__(self, rps: float, burst: int):
+        self.rps = rps
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        with self._lock:
+            now = time.monotonic()
+            # No refill accrues while a penalty is in force
+            if now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rps)
+                self._updated = now
+            # Reserve now; a negative balance is this caller's place in the queue,
+            # counted from the end of any penalty so wakeups stay spaced
+            self._tokens -= 1
+            wait = max(self._blocked_until, now) + max(0.0, -self._tokens / self.rps) - now
+        if wait > 0:
+            time.sleep(wait)
+    
+    def penalize(self, seconds: float):
+        """Stop handing out tokens for `seconds` (e.g. from Retry-After)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, self._blocked_until)
+
+
+_SUBGRAPH_BUCKET = TokenBucket(Config.whale.subgraph_rps, Config.whale.subgraph_burst)
+
+
+def _retry_after_seconds(response: requests.Response) -> float:
+    """Seconds to back off after a 429, from Retry-After when it's numeric."""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER)))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+def make_subgraph_session(pool_size: int = SUBGRAPH_POOL_SIZE) -> requests.Session:
+    """Keep-alive session sized for concurrent subgraph queries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def ttl_cache(maxsize: int = SUBGRAPH_CACHE_SIZE, ttl: float = SUBGRAPH_CACHE_TTL):
+    """
+    LRU + TTL cache for query_subgraph-style functions (query, variables, session).
+    
+    Keyed on (query, variables); the session is not part of the key. Concurrent
+    calls for a key already in flight wait for that call instead of issuing
+    their own. None results (errors) are not cached.
+    """
+    def decorator(func):
+        cache: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (expires_at, result)
+        in_flight: Dict[tuple, threading.Event] = {}
+        lock = threading.RLock()
+        
+        @functools.wraps(func)
+        def wrapper(query: str, variables: Dict = None, session: Optional[requests.Session] = None):
+            key = (query, _encode_json(variables or {}, sort_keys=True))
+            while True:
+                with lock:
+                    hit = cache.get(key)
+                    if hit is not None:
+                        if hit[0] > time.monotonic():
+                            cache.move_to_end(key)
+                            return hit[1]
+                        del cache[key]
+                    event = in_flight.get(key)
+                    if event is None:
+                        event = in_flight[key] = threading.Event()
+                        break
+                # Another thread is fetching this key - wait, then re-check
+                event.wait()
+            
+            try:
+                result = func(query, variables, session)
+                if result is not None:
+                    with lock:
+                        cache[key] = (time.monotonic() + ttl, result)
+                        cache.move_to_end(key)
+                        while len(cache) > maxsize:
+                            cache.popitem(last=False)
+                return result
+            finally:
+                with lock:
+                    del in_flight[key]
+                event.set()
+        
+        def cache_clear():
+            with lock:
+                cache.clear()
+        
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SUBGRAPH QUERIES
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def query_subgraph(query: str, variables: Dict = None) -> Optional[Dict]:
-    """Execute a GraphQL query against the Polymarket subgraph."""
+@ttl_cache()
+def query_subgraph(
+    query: str,
+    variables: Dict = None,
+    session: Optional[requests.Session] = None
+) -> Optional[Dict]:
+    """
+    Execute a GraphQL query against the Polymarket subgraph (on `session` if given).
+    
+    Requests are paced by the shared token bucket; a 429 penalizes the bucket
+    by the server's Retry-After and the query is retried once.
+    """
     try:
-        response = requests.post(
-            SUBGRAPH_URL,
-            json={"query": query, "variables": variables or {}},
-            headers={"Content-Type": "application/json"},
-            timeout=REQUEST_TIMEOUT
-        )
+        # Only the variables are encoded per call; the query part is cached
+        body = _query_body_prefix(query) + _encode_json(variables or {}) + b"}"
+        for attempt in range(2):
+            _SUBGRAPH_BUCKET.acquire()
+            response = (session or requests).post(
+                SUBGRAPH_URL,
+                data=body,
+                headers={"Content-Type": "application/json"},
+                timeout=REQUEST_TIMEOUT
+            )
+            if response.status_code != 429:
+                break
+            retry_after = _retry_after_seconds(response)
+            _SUBGRAPH_BUCKET.penalize(retry_after)
+            print(f"  ⚠ Subgraph rate limited, backing off {retry_after:.1f}s")
         response.raise_for_status()
-        data = response.json()
+        
+        # HTML error pages from a proxy aren't worth a parse attempt
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and "json" not in content_type:
+            print(f"  ✗ Subgraph returned {content_type}, not JSON")
+            return None
+        data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
         
         if "errors" in data:
             print(f"  ⚠ Subgraph query error: {data['errors']}")
             return None
         
         return data.get("data")
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError) as e:
+        # ValueError: malformed body (orjson's decode error isn't a RequestException)
         print(f"  ✗ Subgraph request failed: {e}")
         return None
 
 
-def fetch_top_traders(limit: int = 50) -> List[Dict]:
+def fetch_top_traders(limit: int = 50, session: Optional[requests.Session] = None) -> List[Dict]:
     """
     Fetch top traders by realized PnL from the subgraph.
     
     Note: The actual query structure depends on the subgraph schema.
     This is a template that may need adjustment based on the live schema.
     """
-    query = """
-    query TopTraders($limit: Int!) {
-        userPositions(
-            first: $limit
-            orderBy: realizedPnl
-            orderDirection: desc
-            where: { realizedPnl_gt: "0" }
-        ) {
-            id
-            user
-            realizedPnl
-            market {
-                id
-                question
-            }
-        }
-    }
-    """
-    
-    result = query_subgraph(query, {"limit": limit})
+    result = query_subgraph(TOP_TRADERS_QUERY, {"limit": limit}, session)
     
     if result and "userPositions" in result:
         return result["userPositions"]
@@ -135,67 +526,132 @@ def fetch_top_traders(limit: int = 50) -> List[Dict]:
     return []
 
 
-def fetch_wallet_positions(wallet_address: str) -> List[Dict]:
+def fetch_top_traders_paginated(
+    batch: int = 100,
+    session: Optional[requests.Session] = None,
+    max_rows: int = TOP_TRADERS_MAX_ROWS
+) -> Iterator[Dict]:
+    """
+    Yield top-trader positions (highest realized PnL first), one page at a time.
+    
+    The next page is only requested once the caller has consumed the
+    current one, so a consumer that stops early never fetches it.
+    """
+    skip = 0
+    while skip < max_rows:
+        first = min(batch, max_rows - skip)
+        result = query_subgraph(TOP_TRADERS_QUERY, {"limit": first, "skip": skip}, session)
+        rows = result.get("userPositions", []) if result else []
+        yield from rows
+        if len(rows) < first:
+            return
+        skip += first
+
+
+def _fetch_all_positions(
+    query: str,
+    variables: Dict,
+    session: Optional[requests.Session] = None
+) -> Optional[Tuple[List[Dict], Dict]]:
+    """
+    Page a userPositions query to the end with an `id_gt` cursor.
+    
+    Cursor paging has no depth limit, unlike `skip`. Returns all rows plus
+    the first page's result (for any extra top-level fields), or None if any
+    page failed, so callers never mistake a partial book for a complete one.
+    """
+    rows: List[Dict] = []
+    first_result = None
+    cursor = ""
+    while True:
+        result = query_subgraph(query, {**variables, "first": SUBGRAPH_PAGE_SIZE, "cursor": cursor}, session)
+        if result is None:
+            return None
+        if first_result is None:
+            first_result = result
+        page = result.get("userPositions") or []
+        rows.extend(page)
+        if len(page) < SUBGRAPH_PAGE_SIZE:
+            return rows, first_result
+        cursor = page[-1]["id"]
+
+
+def _by_value_desc(rows: List[Dict]) -> List[Dict]:
+    """Largest positions first (the order the book and exports are built in)."""
+    def value(row):
+        try:
+            return float(row.get("value", 0))
+        except (TypeError, ValueError):
+            return float("-inf")
+    return sorted(rows, key=value, reverse=True)
+
+
+def fetch_wallet_positions(wallet_address: str, session: Optional[requests.Session] = None) -> List[Dict]:
     """
     Fetch all positions for a specific wallet address.
     """
-    query = """
-    query WalletPositions($wallet: String!) {
-        userPositions(
-            where: { user: $wallet }
-            orderBy: value
-            orderDirection: desc
-        ) {
-            id
-            market {
-                id
-                question
-                slug
-            }
-            outcome
-            size
-            averagePrice
-            realizedPnl
-            value
-        }
-    }
+    return fetch_wallet_snapshot(wallet_address, session)[0]
+
+
+def fetch_wallet_snapshot(
+    wallet_address: str,
+    session: Optional[requests.Session] = None
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Fetch a wallet's positions plus the timestamp of its latest trade.
+    The timestamp is None when the subgraph has no trade for the wallet;
+    a failed fetch returns no rows.
     """
+    fetched = _fetch_all_positions(WALLET_POSITIONS_QUERY, {"wallet": _norm_addr(wallet_address)}, session)
+    if fetched is None:
+        return [], None
     
-    result = query_subgraph(query, {"wallet": wallet_address.lower()})
+    rows, first_result = fetched
+    last_trade = first_result.get("lastTrade") or []
+    return _by_value_desc(rows), (last_trade[0].get("timestamp") if last_trade else None)
+
+
+def fetch_wallet_positions_batch(
+    wallets: List[str],
+    session: Optional[requests.Session] = None
+) -> Dict[str, List[Dict]]:
+    """
+    Fetch positions for many wallets with one userPositions query per batch.
     
-    if result and "userPositions" in result:
-        return result["userPositions"]
+    Wallets are sent POSITIONS_BATCH_SIZE at a time via `user_in`, paging
+    through each batch's results the same way as the single-wallet query,
+    and the flat rows are grouped by user. Every wallet of a batch that was
+    fetched completely has an entry (possibly empty); wallets of a batch
+    with a failed page are absent.
+    """
+    wallets = [_norm_addr(w) for w in wallets]
+    grouped: Dict[str, List[Dict]] = {}
     
-    return []
+    for i in range(0, len(wallets), POSITIONS_BATCH_SIZE):
+        batch = wallets[i:i + POSITIONS_BATCH_SIZE]
+        fetched = _fetch_all_positions(WALLET_POSITIONS_BATCH_QUERY, {"wallets": batch}, session)
+        if fetched is None:
+            print(f"  ✗ Position fetch failed for {len(batch)} wallets; keeping their last books")
+            continue
+        
+        batch_rows: Dict[str, List[Dict]] = {w: [] for w in batch}
+        for row in fetched[0]:
+            batch_rows.setdefault(_norm_addr(str(row.get("user", ""))), []).append(row)
+        for wallet, rows in batch_rows.items():
+            grouped[wallet] = _by_value_desc(rows)
+    
+    return grouped
 
 
-def fetch_recent_trades(wallet_address: str, limit: int = 20) -> List[Dict]:
+def fetch_recent_trades(
+    wallet_address: str,
+    limit: int = 20,
+    session: Optional[requests.Session] = None
+) -> List[Dict]:
     """
     Fetch recent trades for a wallet.
     """
-    query = """
-    query RecentTrades($wallet: String!, $limit: Int!) {
-        trades(
-            where: { maker: $wallet }
-            first: $limit
-            orderBy: timestamp
-            orderDirection: desc
-        ) {
-            id
-            market {
-                id
-                question
-            }
-            outcome
-            side
-            price
-            size
-            timestamp
-        }
-    }
-    """
-    
-    result = query_subgraph(query, {"wallet": wallet_address.lower(), "limit": limit})
+    result = query_subgraph(RECENT_TRADES_QUERY, {"wallet": _norm_addr(wallet_address), "limit": limit}, session)
     
     if result and "trades" in result:
         return result["trades"]
@@ -242,26 +698,35 @@ class WhaleTracker:
         self.recent_activities: List[WhaleActivity] = []
         self.last_refresh: Optional[datetime] = None
         
+        # Shared by the refresh workers (pacing is the module's token bucket)
+        self.session = make_subgraph_session()
+        
+        # Guards tracked_wallets membership against add/remove from other threads
+        self._lock = threading.RLock()
+        
         # Initialize with known whales from config
         for address in Config.whale.known_whales:
             self.add_wallet(address)
     
     def add_wallet(self, address: str, alias: Optional[str] = None):
         """Add a wallet to track."""
-        address_lower = address.lower()
-        if address_lower not in self.tracked_wallets:
+        address_lower = _norm_addr(address)
+        with self._lock:
+            if address_lower in self.tracked_wallets:
+                return
             self.tracked_wallets[address_lower] = WhaleWallet(
                 address=address_lower,
                 alias=alias
             )
-            print(f"  ✓ Now tracking wallet: {alias or address[:16]}...")
+        print(f"  ✓ Now tracking wallet: {alias or address[:16]}...")
     
     def remove_wallet(self, address: str):
         """Stop tracking a wallet."""
-        address_lower = address.lower()
-        if address_lower in self.tracked_wallets:
-            del self.tracked_wallets[address_lower]
-            print(f"  ✓ Stopped tracking wallet: {address[:16]}...")
+        address_lower = _norm_addr(address)
+        with self._lock:
+            if self.tracked_wallets.pop(address_lower, None) is None:
+                return
+        print(f"  ✓ Stopped tracking wallet: {address[:16]}...")
     
     def discover_top_wallets(self, min_pnl: float = None, limit: int = 20) -> List[str]:
         """
@@ -273,22 +738,23 @@ class WhaleTracker:
         
         min_pnl = min_pnl or Config.whale.min_pnl_to_track
         
-        # Try subgraph first
-        top_traders = fetch_top_traders(limit=limit * 2)
-        
         discovered = []
         seen_users = set()
         
-        for position in top_traders:
+        # Pages of `limit` rows until enough unique wallets turn up
+        for position in fetch_top_traders_paginated(batch=max(limit, 1), session=self.session):
             user = position.get("user", "")
-            pnl = float(position.get("realizedPnl", 0))
+            if not user or user in seen_users or _norm_addr(user) in _NON_WALLET_ADDRESSES:
+                continue
             
-            if user and user not in seen_users and pnl >= min_pnl:
-                seen_users.add(user)
-                discovered.append(user)
-                
-                if len(discovered) >= limit:
-                    break
+            # Rows come in descending PnL order, so nothing further qualifies
+            if float(position.get("realizedPnl", 0)) < min_pnl:
+                break
+            
+            seen_users.add(user)
+            discovered.append(user)
+            if len(discovered) >= limit:
+                break
         
         print(f"  Found {len(discovered)} wallets with PnL >= ${min_pnl:,.0f}")
         
@@ -296,7 +762,7 @@ class WhaleTracker:
     
     def refresh_wallet_positions(self, wallet_address: str) -> Optional[WhaleWallet]:
         """Refresh position data for a specific wallet."""
-        address_lower = wallet_address.lower()
+        address_lower = _norm_addr(wallet_address)
         
         if address_lower not in self.tracked_wallets:
             self.add_wallet(address_lower)
@@ -304,55 +770,88 @@ class WhaleTracker:
         wallet = self.tracked_wallets[address_lower]
         
         # Fetch positions from subgraph
-        position_data = fetch_wallet_positions(address_lower)
+        position_data, last_trade_ts = fetch_wallet_snapshot(address_lower, session=self.session)
+        
+        # No new trade and the same position values: the book is still current
+        if (
+            last_trade_ts is not None
+            and last_trade_ts == wallet.last_trade_ts
+            and tuple(pos.get("value") for pos in position_data) == wallet.position_values
+        ):
+            wallet.last_updated = datetime.utcnow()
+            return wallet
         
+        return self._apply_positions(wallet, position_data, last_trade_ts)
+    
+    def _apply_positions(
+        self,
+        wallet: WhaleWallet,
+        position_data: List[Dict],
+        last_trade_ts: Optional[str] = None
+    ) -> WhaleWallet:
+        """Rebuild a wallet's positions and PnL totals from raw subgraph rows."""
         if not position_data:
-            print(f"  ⚠ No positions found for {address_lower[:16]}...")
+            print(f"  ⚠ No positions found for {wallet.address[:16]}...")
             return wallet
         
-        wallet.positions = []
-        total_realized = 0
-        total_unrealized = 0
+        wallet.last_trade_ts = last_trade_ts
+        wallet.position_values = tuple(pos.get("value") for pos in position_data)
         
+        # Parse pass: skip malformed rows, keep the numbers column-ready
+        numbers = []
+        labels = []
         for pos in position_data:
             try:
-                realized = float(pos.get("realizedPnl", 0))
-                size = float(pos.get("size", 0))
-                avg_price = float(pos.get("averagePrice", 0))
-                value = float(pos.get("value", 0))
-                
-                # Calculate unrealized PnL (simplified)
-                current_value = value
-                cost_basis = size * avg_price
-                unrealized = current_value - cost_basis
-                
-                total_realized += realized
-                total_unrealized += unrealized
-                
-                market = pos.get("market", {})
-                
-                wallet.positions.append(WalletPosition(
-                    market_id=market.get("id", ""),
-                    market_question=market.get("question", "Unknown"),
-                    outcome=pos.get("outcome", "Unknown"),
-                    size=size,
-                    avg_price=avg_price,
-                    current_price=value / size if size > 0 else 0,
-                    unrealized_pnl=unrealized,
-                    realized_pnl=realized
+                numbers.append((
+                    float(pos.get("size", 0)),
+                    float(pos.get("averagePrice", 0)),
+                    float(pos.get("value", 0)),
+                    float(pos.get("realizedPnl", 0))
                 ))
-            except (ValueError, TypeError) as e:
+            except (ValueError, TypeError):
                 continue
+            market = pos.get("market", {})
+            labels.append((
+                market.get("id", ""),
+                market.get("question", "Unknown"),
+                pos.get("outcome", "Unknown")
+            ))
+        
+        columns = np.array(numbers, dtype=np.float64).reshape(-1, 4).T
+        size, avg_price, value, realized = (np.ascontiguousarray(c) for c in columns)
+        current_price, unrealized, total_realized, total_unrealized = position_pnl(
+            size, avg_price, value, realized
+        )
         
-        wallet.total_realized_pnl = total_realized
-        wallet.total_unrealized_pnl = total_unrealized
+        market_ids, questions, outcomes = (
+            np.array(col, dtype=object) for col in (zip(*labels) if labels else ((), (), ()))
+        )
+        wallet.positions = PositionBook(
+            market_ids=market_ids,
+            questions=questions,
+            outcomes=outcomes,
+            sizes=size,
+            avg_prices=avg_price,
+            current_prices=current_price,
+            unrealized=unrealized,
+            realized=realized,
+            pnl_percent=np.divide(
+                current_price - avg_price, avg_price,
+                out=np.zeros_like(avg_price), where=avg_price != 0
+            ) * 100
+        )
+        
+        wallet.total_realized_pnl = float(total_realized)
+        wallet.total_unrealized_pnl = float(total_unrealized)
+        wallet.total_pnl = wallet.total_realized_pnl + wallet.total_unrealized_pnl
         wallet.last_updated = datetime.utcnow()
         
         return wallet
     
     def refresh_all(self, verbose: bool = True) -> Dict[str, Any]:
         """Refresh data for all tracked wallets."""
-        start_time = datetime.utcnow()
+        start_time = datetime.utcnow()  # Wall clock for display; timing uses the monotonic clock
+        start_ns = time.perf_counter_ns()
         
         if verbose:
             print(f"\n{'═' * 70}")
@@ -361,16 +860,39 @@ class WhaleTracker:
             print(f"   Started: {start_time.strftime('%Y-%m-%d %H:%M:%S UTC')}")
             print(f"{'═' * 70}\n")
         
-        results = []
+        # One immutable snapshot, taken under the lock, serves batching and reporting
+        with self._lock:
+            addresses = tuple(self.tracked_wallets)
+        batches = [
+            addresses[i:i + POSITIONS_BATCH_SIZE]
+            for i in range(0, len(addresses), POSITIONS_BATCH_SIZE)
+        ]
+        position_data: Dict[str, List[Dict]] = {}
         
-        for address in list(self.tracked_wallets.keys()):
+        # One user_in query per batch of wallets; batches run concurrently and
+        # the token bucket keeps the combined request rate within the subgraph's limits
+        with ThreadPoolExecutor(max_workers=REFRESH_WORKERS) as ex:
+            futures = {
+                ex.submit(fetch_wallet_positions_batch, batch, self.session): batch
+                for batch in batches
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    position_data.update(future.result())
+                except Exception as e:
+                    print(f"  ✗ Refresh failed for {len(batch)} wallets: {e}")
+        
+        # Populate wallets locally, reporting in tracking order
+        results = []
+        for address in addresses:
+            wallet = self.tracked_wallets.get(address)
+            if wallet is None or address not in position_data:
+                continue  # Removed while in flight, or its batch failed
+            wallet = self._apply_positions(wallet, position_data.get(address, []))
             if verbose:
-                wallet = self.tracked_wallets[address]
                 name = wallet.alias or f"{address[:10]}..."
-                print(f"  📊 Refreshing {name}...")
-            
-            wallet = self.refresh_wallet_positions(address)
-            
+                print(f"  📊 Refreshed {name}")
             if wallet:
                 results.append({
                     "address": wallet.address,
@@ -380,11 +902,9 @@ class WhaleTracker:
                     "total_pnl": wallet.total_pnl,
                     "position_count": len(wallet.positions)
                 })
-            
-            time.sleep(1)  # Rate limiting
         
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
         self.last_refresh = datetime.utcnow()
-        duration = (self.last_refresh - start_time).total_seconds()
         
         if verbose:
             self._print_summary(results, duration)
@@ -409,65 +929,112 @@ class WhaleTracker:
         # Sort by total PnL
         sorted_results = sorted(results, key=lambda x: x["total_pnl"], reverse=True)
         
-        print(f"\n{'Address':<20} {'Alias':<15} {'Realized':<15} {'Unrealized':<15} {'Total PnL':<15}")
-        print("─" * 80)
-        
-        for w in sorted_results:
-            addr = w["address"][:18] + ".."
-            alias = (w["alias"] or "-")[:13]
-            realized = f"${w['realized_pnl']:,.0f}"
-            unrealized = f"${w['unrealized_pnl']:,.0f}"
-            total = f"${w['total_pnl']:,.0f}"
-            
-            print(f"{addr:<20} {alias:<15} {realized:<15} {unrealized:<15} {total:<15}")
+        # Build the whole table, then print it in one write
+        row = _SUMMARY_ROW.format
+        lines = [_SUMMARY_HEADER, "─" * 80]
+        lines.extend(
+            row(
+                w["address"][:18] + "..",
+                (w["alias"] or "-")[:13],
+                f"${w['realized_pnl']:,.0f}",
+                f"${w['unrealized_pnl']:,.0f}",
+                f"${w['total_pnl']:,.0f}"
+            )
+            for w in sorted_results
+        )
+        print("\n" + "\n".join(lines))
         
         print(f"\n{'═' * 70}\n")
     
     def get_top_positions(self, limit: int = 10) -> List[Dict]:
         """Get the highest conviction positions across all tracked whales."""
-        all_positions = []
-        
-        for wallet in self.tracked_wallets.values():
-            for pos in wallet.positions:
-                all_positions.append({
-                    "wallet": wallet.alias or wallet.address[:16],
-                    "market": pos.market_question,
-                    "outcome": pos.outcome,
-                    "size": pos.size,
-                    "avg_price": pos.avg_price,
-                    "unrealized_pnl": pos.unrealized_pnl
-                })
+        wallets = [w for w in self.tracked_wallets.values() if len(w.positions)]
+        if not wallets or limit <= 0:
+            return []
+        
+        # Select on the size column alone; labels are only read for the winners
+        abs_size = np.abs(np.concatenate([w.positions.sizes for w in wallets]))
+        offsets = np.cumsum([len(w.positions) for w in wallets])
         
-        # Sort by position size (USD value)
-        all_positions.sort(key=lambda x: abs(x["size"]), reverse=True)
+        # Top-k by absolute size; a stable sort keeps ties in original order,
+        # exactly as the old full list sort did
+        idx = np.argsort(-abs_size, kind="stable")[:limit]
+        owner_idx = np.searchsorted(offsets, idx, side="right")
         
-        return all_positions[:limit]
+        top = []
+        for i, o in zip(idx.tolist(), owner_idx.tolist()):
+            wallet = wallets[o]
+            book = wallet.positions
+            row = i - (int(offsets[o - 1]) if o else 0)
+            top.append({
+                "wallet": wallet.alias or wallet.address[:16],
+                "market": book.questions[row],
+                "outcome": book.outcomes[row],
+                "size": float(book.sizes[row]),
+                "avg_price": float(book.avg_prices[row]),
+                "unrealized_pnl": float(book.unrealized[row])
+            })
+        return top
     
-    def export_json(self) -> str:
-        """Export all tracking data as JSON."""
-        return json.dumps({
-            "last_refresh": self.last_refresh.isoformat() if self.last_refresh else None,
-            "wallets": [
+    def _wallet_record(self, w: WhaleWallet) -> Dict:
+        """One wallet's entry in the JSON export."""
+        return {
+            "address": w.address,
+            "alias": w.alias,
+            "realized_pnl": w.total_realized_pnl,
+            "unrealized_pnl": w.total_unrealized_pnl,
+            "total_pnl": w.total_pnl,
+            "positions": [
                 {
-                    "address": w.address,
-                    "alias": w.alias,
-                    "realized_pnl": w.total_realized_pnl,
-                    "unrealized_pnl": w.total_unrealized_pnl,
-                    "total_pnl": w.total_pnl,
-                    "positions": [
-                        {
-                            "market": p.market_question[:60],
-                            "outcome": p.outcome,
-                            "size": p.size,
-                            "avg_price": p.avg_price,
-                            "unrealized_pnl": p.unrealized_pnl
-                        }
-                        for p in w.positions
-                    ]
+                    "market": question[:60],
+                    "outcome": outcome,
+                    "size": size,
+                    "avg_price": avg_price,
+                    "unrealized_pnl": unrealized
                 }
-                for w in self.tracked_wallets.values()
+                for question, outcome, size, avg_price, unrealized in zip(
+                    w.positions.questions.tolist(), w.positions.outcomes.tolist(),
+                    w.positions.sizes.tolist(), w.positions.avg_prices.tolist(),
+                    w.positions.unrealized.tolist()
+                )
             ]
-        }, indent=2)
+        }
+    
+    def export_json_to(self, fp, indent: bool = False):
+        """
+        Write all tracking data as JSON to a binary file object.
+        
+        Wallets are encoded and written one at a time, so the full document
+        never exists in memory at once.
+        """
+        last_refresh = _encode_json(self.last_refresh.isoformat() if self.last_refresh else None)
+        if indent:
+            fp.write(b'{\n  "last_refresh": ' + last_refresh + b',\n  "wallets": [')
+        else:
+            fp.write(b'{"last_refresh":' + last_refresh + b',"wallets":[')
+        
+        wrote_any = False
+        for w in self.tracked_wallets.values():
+            record = _encode_json(self._wallet_record(w), indent=indent)
+            if wrote_any:
+                fp.write(b",")
+            if indent:
+                # Nest the wallet's own 2-space indentation two levels deeper
+                fp.write(b"\n    " + record.replace(b"\n", b"\n    "))
+            else:
+                fp.write(record)
+            wrote_any = True
+        
+        if indent:
+            fp.write((b"\n  ]" if wrote_any else b"]") + b"\n}")
+        else:
+            fp.write(b"]}")
+    
+    def export_json(self) -> str:
+        """Export all tracking data as JSON."""
+        buf = io.BytesIO()
+        self.export_json_to(buf, indent=True)
+        return buf.getvalue().decode()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════